@@ -2,7 +2,7 @@
 MSSQL Connection Handler
 """
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import text
 
@@ -22,15 +22,22 @@ class MssqlConnector:
         get_engine: Returns the SQLAlchemy engine.
     """
 
-    def __init__(self, logger, db_url: str):
+    def __init__(
+        self, logger, db_url: str, fast_executemany: bool = True, pool_size: int = None
+    ):
         """
         Initialize the DatabaseConnector with the database URL.
 
         :param logger: Logger instance for logging information.
         :param db_url: Database connection string.
+        :param fast_executemany: Sends executemany parameters in bulk (pyodbc driver only).
+        :param pool_size: Connections kept by the engine's pool, e.g. one per load
+            worker (default is SQLAlchemy's).
         """
         self._logger = logger
         self.db_url = db_url
+        self.fast_executemany = fast_executemany
+        self.pool_size = pool_size
         self.engine = None
 
     def connect(self) -> Engine:
@@ -40,7 +47,12 @@ class MssqlConnector:
         :return: SQLAlchemy Engine instance.
         """
         try:
-            self.engine = create_engine(self.db_url)
+            _engine_kwargs = {}
+            if self.fast_executemany and make_url(self.db_url).drivername == 'mssql+pyodbc':
+                _engine_kwargs['fast_executemany'] = True
+            if self.pool_size:
+                _engine_kwargs['pool_size'] = self.pool_size
+            self.engine = create_engine(self.db_url, **_engine_kwargs)
             with self.engine.connect() as connection: # pylint: disable=unused-variable
                 self._logger.info("Connected to the database successfully.")
             self._logger.info("Engine created successfully.")
@@ -1,6 +1,30 @@
 """
 Database Models module
 """
+import os
+from typing import Annotated
+
+from pydantic import Field
+from sqlalchemy import BigInteger, String
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+# surrogate keys of the star schema: 'hash' (MD5 hex, String(32)) or 'integer' (BIGINT),
+# read from WAREHOUSE_KEY_MODE as set by the application before importing the models
+SURROGATE_KEY_MODE = (
+    "integer" if os.getenv("WAREHOUSE_KEY_MODE", "hash").lower() == "integer" else "hash"
+)
+
+# pydantic type of the surrogate keys
+SurrogateKey = (
+    Annotated[int, Field(gt=0)] if SURROGATE_KEY_MODE == "integer"
+    else Annotated[str, Field(max_length=32)]
+)
+
+
+def surrogate_key_type():
+    """
+    Returns the column type of the surrogate keys for the configured key mode.
+    """
+    return BigInteger() if SURROGATE_KEY_MODE == "integer" else String(32)
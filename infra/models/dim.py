@@ -11,14 +11,14 @@ __table_args__ - Scheman name and Index for the table declarations
 vars with Column use - columns of the table
 """
 from sqlalchemy import (
-    Column, Integer, String, Date, Boolean
+    Column, Integer, BigInteger, String, Date, Boolean
 )
 from sqlalchemy.orm import (
     relationship
 )
 
 
-from . import Base
+from . import Base, surrogate_key_type
 
 
 _SCHEMA_NAME = 'sales_warehousing'
@@ -44,7 +44,7 @@ class DimTime(Base):
     __tablename__ = 'dim_time'
     __table_args__ = {'schema': _SCHEMA_NAME}
 
-    time_id = Column(String(32), primary_key=True)
+    time_id = Column(surrogate_key_type(), primary_key=True, autoincrement=False)
     date = Column(Date, nullable=True)
     year = Column(Integer, nullable=True)
     quarter = Column(Integer, nullable=True)
@@ -70,7 +70,7 @@ class DimLocation(Base):
     __tablename__ = 'dim_location'
     __table_args__ = {'schema': _SCHEMA_NAME}
 
-    location_id = Column(String(32), primary_key=True)
+    location_id = Column(surrogate_key_type(), primary_key=True, autoincrement=False)
     location_name = Column(String(255), nullable=True)
 
     transactions = relationship("FactSalesTransaction", back_populates="location")
@@ -88,7 +88,7 @@ class DimCustomer(Base):
     __tablename__ = 'dim_customer'
     __table_args__ = {'schema': _SCHEMA_NAME}
 
-    customer_id = Column(String(32), primary_key=True)
+    customer_id = Column(surrogate_key_type(), primary_key=True, autoincrement=False)
     customer_code = Column(String(255), nullable=True)
     is_known_customer = Column(Boolean, nullable=False)
 
@@ -107,7 +107,7 @@ class DimProduct(Base):
     __tablename__ = 'dim_product'
     __table_args__ = {'schema': _SCHEMA_NAME}
 
-    product_id = Column(String(32), primary_key=True)
+    product_id = Column(surrogate_key_type(), primary_key=True, autoincrement=False)
     stock_code = Column(String(255), nullable=True)
     description = Column(String(255), nullable=True)
 
@@ -127,8 +127,25 @@ class DimMetadataTransaction(Base):
     __tablename__ = 'dim_metadata_transactions'
     __table_args__ = {'schema': 'sales_warehousing'}
 
-    metadata_id = Column(String(32), primary_key=True, nullable=False)
+    metadata_id = Column(surrogate_key_type(), primary_key=True, nullable=False, autoincrement=False)
     transaction_description = Column(String(255), nullable=True)
     transaction_category = Column(String(50), nullable=True)
 
     transactions = relationship("FactSalesTransaction", back_populates="metadata_transactions")
+
+
+class SurrogateKeyMap(Base):
+    """
+    Maps the MD5 hash keys to the BIGINT surrogate keys of the integer key mode.
+
+    Attributes:
+        key_name (str): Name of the key column (e.g., "customer_id").
+        hash_key (str): MD5 hex of the natural key.
+        surrogate_id (int): BIGINT surrogate key assigned to the hash key.
+    """
+    __tablename__ = 'surrogate_key_map'
+    __table_args__ = {'schema': _SCHEMA_NAME}
+
+    key_name = Column(String(50), primary_key=True)
+    hash_key = Column(String(32), primary_key=True)
+    surrogate_id = Column(BigInteger, nullable=False)
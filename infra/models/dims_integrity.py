@@ -9,6 +9,8 @@ from pydantic import (
 )
 import pandas as pd
 
+from . import SurrogateKey
+
 
 class DimTimeValidation(BaseModel):
     """
@@ -53,7 +55,7 @@ class DimLocationValidation(BaseModel):
     - `location_id`: Optional positive integer.
     - `location_name`: Mandatory string with a max length of 255 characters.
     """
-    location_id: Optional[str] = Field(None, max_length=32)
+    location_id: Optional[SurrogateKey] = None
     location_name: Optional[str] = Field(None, max_length=255)
 
 class DimCustomerValidation(BaseModel):
@@ -63,7 +65,7 @@ class DimCustomerValidation(BaseModel):
     - `customer_code`: Optional string with a max length of 255 characters.
     - `is_known_customer`: Boolean indicating if the customer is identified.
     """
-    customer_id: Optional[str] = Field(..., max_length=32)
+    customer_id: Optional[SurrogateKey] = Field(...)
     customer_code: Optional[str] = Field(None, max_length=255)
     is_known_customer: bool
 
@@ -74,7 +76,7 @@ class DimProductValidation(BaseModel):
     - `stock_code`: Mandatory string with a max length of 255 characters.
     - `description`: Mandatory string with a max length of 255 characters.
     """
-    product_id: str = Field(..., max_length=32)
+    product_id: SurrogateKey
     stock_code: str = Field(..., max_length=255)
     description: str = Field(None, max_length=255)
 
@@ -86,6 +88,17 @@ class DimMetadataTransactionValidation(BaseModel):
     - `transaction_category`: Mandatory string with a max length of 50 characters
       indicating the type of transaction (e.g., 'sale', 'adjustment', 'return').
     """
-    metadata_id: str = Field(None, max_length=32)
+    metadata_id: SurrogateKey = None
     transaction_description: str = Field(..., max_length=255)
     transaction_category: str = Field(..., max_length=50)
+
+class SurrogateKeyMapValidation(BaseModel):
+    """
+    Validation model for the surrogate key mapping (integer key mode). Validates:
+    - `key_name`: Mandatory string with a max length of 50 characters.
+    - `hash_key`: Mandatory MD5 hex string (32 characters).
+    - `surrogate_id`: Mandatory positive integer.
+    """
+    key_name: str = Field(..., max_length=50)
+    hash_key: str = Field(..., min_length=32, max_length=32)
+    surrogate_id: int = Field(..., gt=0)
@@ -13,7 +13,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 
 
-from . import Base
+from . import Base, surrogate_key_type
 
 
 _SCHEMA_NAME = 'sales_warehousing'
@@ -24,7 +24,8 @@ class FactSalesTransaction(Base):
     Represents the fact table for transactions in the data warehouse.
 
     Attributes:
-        transaction_id (int): Primary key for the transaction fact table.
+        transaction_id (str | int): Primary key for the transaction fact table
+            (keys are MD5 hex or BIGINT, see WAREHOUSE_KEY_MODE).
         time_id (int): Foreign key referencing the time dimension.
         location_id (int): Foreign key referencing the location dimension.
         customer_id (int): Foreign key referencing the customer dimension (nullable).
@@ -37,12 +38,12 @@ class FactSalesTransaction(Base):
     __tablename__ = 'fact_sales_transactions'
     __table_args__ = {'schema': _SCHEMA_NAME}
 
-    transaction_id = Column(String(32), primary_key=True)
-    time_id = Column(String(32), ForeignKey('sales_warehousing.dim_time.time_id'), nullable=False)
-    location_id = Column(String(32), ForeignKey('sales_warehousing.dim_location.location_id'), nullable=False)
-    customer_id = Column(String(32), ForeignKey('sales_warehousing.dim_customer.customer_id'), nullable=True)
-    product_id = Column(String(32), ForeignKey('sales_warehousing.dim_product.product_id'), nullable=False)
-    metadata_id = Column(String(32), ForeignKey('sales_warehousing.dim_metadata_transactions.metadata_id'), nullable=False)
+    transaction_id = Column(surrogate_key_type(), primary_key=True, autoincrement=False)
+    time_id = Column(surrogate_key_type(), ForeignKey('sales_warehousing.dim_time.time_id'), nullable=False)
+    location_id = Column(surrogate_key_type(), ForeignKey('sales_warehousing.dim_location.location_id'), nullable=False)
+    customer_id = Column(surrogate_key_type(), ForeignKey('sales_warehousing.dim_customer.customer_id'), nullable=True)
+    product_id = Column(surrogate_key_type(), ForeignKey('sales_warehousing.dim_product.product_id'), nullable=False)
+    metadata_id = Column(surrogate_key_type(), ForeignKey('sales_warehousing.dim_metadata_transactions.metadata_id'), nullable=False)
     invoice_id = Column(String(32), nullable=False)
     quantity = Column(Integer, nullable=False)
     price = Column(DECIMAL(precision=10, scale=2), nullable=True) 
@@ -14,11 +14,14 @@ from pydantic import (
     field_validator
 )
 
+from . import SurrogateKey
+
 
 class FactSalesTransactionValidation(BaseModel):
     """
     Validation model for transaction fact table. Validates:
-    - `transaction_id`: Optional hash string (up to 32 characters).
+    - `transaction_id`: Mandatory surrogate key, a hash string (up to 32 characters)
+    or a positive integer in the integer key mode (as every key below).
     - `time_id`: Mandatory positive integer linking to the time dimension.
     - `location_id`: Mandatory positive integer linking to the location dimension.
     - `customer_id`: Optional positive integer linking to the customer dimension.
@@ -30,12 +33,12 @@ class FactSalesTransactionValidation(BaseModel):
     - `price`: Optional decimal representing the transaction price
     (non-negative or negative for adjustments).
     """
-    transaction_id: str = Field(..., max_length=32)
-    time_id: str = Field(..., max_length=32)
-    location_id: Optional[str] = Field(None, max_length=32)
-    customer_id: Optional[str] = Field(None, max_length=32)
-    product_id: str = Field(None, max_length=32)
-    metadata_id: str = Field(None, max_length=32)
+    transaction_id: SurrogateKey
+    time_id: SurrogateKey
+    location_id: Optional[SurrogateKey] = None
+    customer_id: Optional[SurrogateKey] = None
+    product_id: SurrogateKey = None
+    metadata_id: SurrogateKey = None
     invoice_id: str
     quantity: int
     price: Optional[Decimal] = Field(None, description="Price must be a valid decimal value.")
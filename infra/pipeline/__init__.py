@@ -4,19 +4,60 @@ Pipeline transformations package
 from infra.pipeline.pipeline_transformers import (
     sanitize_column_data,
     sanitize_text,
+    normalize_text_column,
+    get_memory_report,
+    hash_key_column,
+    hash_composite_key,
+    InvoiceKeyIndex,
+    flag_product_returns,
+    DescriptionClassifier,
+    TransactionCategorizer,
+    CalendarDimension,
+    SurrogateKeyMapper,
+    DimensionKeyRegistry,
+    RowFingerprintIndex,
     generate_warehouse_sales_tables,
+    ValidationErrorStore,
+    validate_rows_pydantic,
     validate_warehouse_sales_data,
     validate_data_integrity
 )
 from infra.pipeline.pipeline_metadata import (
     NORMATIZE_LOCATION_MAP,
     CLOUD_LOST_PRODUCTS_WORDS,
+    TEST_DATA_WORDS,
+    TEST_DATA_COLUMNS,
+    DESCRIPTION_KEYWORD_RULES,
+    TRANSACTION_CATEGORY_RULES,
+    DEFAULT_TRANSACTION_CATEGORY,
     STAGE_III_COLUMNS,
+    STAGE_III_DTYPES,
+    OUTPUT_DATETIME_FORMAT,
+    SURROGATE_KEY_COLUMNS,
+    DIMENSION_KEYS,
+    SURROGATE_KEY_MODE,
+    LOAD_STRATEGIES,
+    DEFAULT_LOAD_STRATEGY,
+    LOAD_PARTITION_COLUMNS,
+    LOAD_DEPENDENCIES,
+    INGESTION_SCHEMA,
+    INGESTION_DATE_FORMATS,
     validation_models,
     models_map
 )
+from infra.pipeline.pipeline_loaders import (
+    bulk_insert_table,
+    upsert_table,
+    merge_table,
+    load_table,
+    partition_table,
+    get_load_levels,
+    load_warehouse_tables
+)
 from infra.pipeline.pipeline_lineage import (
     get_csv_df,
+    apply_ingestion_schema,
+    concat_ingestion_frames,
     PipelineTransformer,
 )
 
@@ -25,13 +66,52 @@ __all__ = [
     'sanitize_column_data',
     'NORMATIZE_LOCATION_MAP',
     'sanitize_text',
+    'normalize_text_column',
+    'get_memory_report',
+    'hash_key_column',
+    'hash_composite_key',
+    'InvoiceKeyIndex',
+    'flag_product_returns',
+    'DescriptionClassifier',
+    'TransactionCategorizer',
+    'CalendarDimension',
+    'SurrogateKeyMapper',
+    'DimensionKeyRegistry',
+    'RowFingerprintIndex',
     'get_csv_df',
+    'apply_ingestion_schema',
+    'concat_ingestion_frames',
     'PipelineTransformer',
     'generate_warehouse_sales_tables',
+    'ValidationErrorStore',
+    'validate_rows_pydantic',
     'validate_warehouse_sales_data',
     'validate_data_integrity',
+    'bulk_insert_table',
+    'upsert_table',
+    'merge_table',
+    'load_table',
+    'partition_table',
+    'get_load_levels',
+    'load_warehouse_tables',
     'CLOUD_LOST_PRODUCTS_WORDS',
+    'TEST_DATA_WORDS',
+    'TEST_DATA_COLUMNS',
+    'DESCRIPTION_KEYWORD_RULES',
+    'TRANSACTION_CATEGORY_RULES',
+    'DEFAULT_TRANSACTION_CATEGORY',
     'STAGE_III_COLUMNS',
+    'STAGE_III_DTYPES',
+    'OUTPUT_DATETIME_FORMAT',
+    'SURROGATE_KEY_COLUMNS',
+    'DIMENSION_KEYS',
+    'SURROGATE_KEY_MODE',
+    'LOAD_STRATEGIES',
+    'DEFAULT_LOAD_STRATEGY',
+    'LOAD_PARTITION_COLUMNS',
+    'LOAD_DEPENDENCIES',
+    'INGESTION_SCHEMA',
+    'INGESTION_DATE_FORMATS',
     'validation_models',
     'models_map'
 ]
@@ -2,64 +2,389 @@
 This module will hold specific functions to handle
 full lineage stages for the pipeline.
 """
-import re
+import math
+import os
+import tempfile
 from datetime import datetime
-from typing import Callable
+from typing import (
+    Callable,
+    Iterator
+)
 
 import numpy as np
 import pandas as pd
-import sqlalchemy.orm
-import sqlalchemy.exc as exc
-from sqlalchemy.orm import sessionmaker
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from pandas.api.types import union_categoricals
+import sqlalchemy
 
 from infra.pipeline import (
     NORMATIZE_LOCATION_MAP,
-    CLOUD_LOST_PRODUCTS_WORDS,
+    DESCRIPTION_KEYWORD_RULES,
+    TEST_DATA_COLUMNS,
     STAGE_III_COLUMNS,
+    STAGE_III_DTYPES,
+    OUTPUT_DATETIME_FORMAT,
+    SURROGATE_KEY_MODE,
+    LOAD_STRATEGIES,
+    DEFAULT_LOAD_STRATEGY,
+    INGESTION_SCHEMA,
+    INGESTION_DATE_FORMATS,
+    normalize_text_column,
+    get_memory_report,
+    InvoiceKeyIndex,
+    CalendarDimension,
+    DimensionKeyRegistry,
+    RowFingerprintIndex,
+    flag_product_returns,
+    DescriptionClassifier,
     generate_warehouse_sales_tables,
     validate_warehouse_sales_data,
     validation_models,
     validate_data_integrity,
-    models_map
+    load_warehouse_tables
 )
 
 
-escaped_keywords = [re.escape(word) for word in CLOUD_LOST_PRODUCTS_WORDS if word]
+# rows sampled to estimate the in-memory footprint of the csv rows
+_CHUNK_SAMPLE_ROWS = 10_000
+# stages I-III peak (masks, stage III text columns) over the typed raw frame size
+_STAGE_MEMORY_FACTOR = 10
+
 
+def _get_read_dtypes(schema: dict, date_formats: dict) -> dict:
+    """
+    Returns the dtypes handed to the CSV parser, datetime columns are read as text.
+    """
+    return {
+        column: 'str' if column in date_formats else dtype
+        for column, dtype in schema.items()
+    }
 
-def get_csv_df(bg_logger, file_path, **kwargs) -> pd.DataFrame:
+
+def _get_arrow_types(schema: dict, date_formats: dict) -> dict:
+    """
+    Returns the Arrow column types of the schema. Text is never inferred, so codes
+    like Customer ID keep their source text, and categoricals are dictionary-encoded.
+    """
+    arrow_types = {}
+    for column, dtype in _get_read_dtypes(schema, date_formats).items():
+        if dtype == 'category':
+            arrow_types[column] = pa.dictionary(pa.int32(), pa.string())
+        elif dtype in ('str', 'string', 'string[pyarrow]'):
+            arrow_types[column] = pa.string()
+        else:
+            arrow_types[column] = pa.from_numpy_dtype(np.dtype(dtype))
+    return arrow_types
+
+
+def apply_ingestion_schema(
+    df: pd.DataFrame,
+    schema: dict = None,
+    date_formats: dict = None
+) -> pd.DataFrame:
     """
-    Reads a CSV file into a DataFrame.
+    Parses the datetime columns and casts raw columns to the declared ingestion dtypes.
+    Args:
+        df: DataFrame holding the raw columns.
+        schema: Mapping of column names to dtypes (defaults to INGESTION_SCHEMA).
+        date_formats: Mapping of datetime columns to their format (defaults to INGESTION_DATE_FORMATS).
+    Returns:
+        The typed DataFrame.
+    """
+    schema = INGESTION_SCHEMA if schema is None else schema
+    date_formats = INGESTION_DATE_FORMATS if date_formats is None else date_formats
+
+    for column, date_format in date_formats.items():
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], format=date_format, errors='coerce')
+    return df.astype(schema)
+
+
+def get_csv_df(
+    bg_logger,
+    file_path,
+    schema: dict = None,
+    date_formats: dict = None,
+    sep: str = ',',
+    encoding: str = 'utf-8',
+    engine: str = 'pyarrow',
+    **kwargs
+) -> pd.DataFrame:
+    """
+    Reads a CSV file into a DataFrame, projecting and typing the columns
+    declared on the ingestion schema with the pyarrow engine.
     Args:
         bg_logger: Logger instance for logging.
-        file_path: Path to the CSV file.
+        file_path: Path to the CSV file or a file-like stream of it.
+        schema: Mapping of column names to dtypes (defaults to INGESTION_SCHEMA).
+        date_formats: Mapping of datetime columns to their format (defaults to INGESTION_DATE_FORMATS).
+        sep: Field delimiter.
+        encoding: Encoding of the CSV file.
+        engine: 'pyarrow', or any pandas parser engine (kwargs are only used by those).
+        kwargs: Additional arguments for reading the CSV file with pandas.
     Returns:
         The DataFrame.
     """
     start_time = datetime.now()
-    df = pd.read_csv(
+    schema = INGESTION_SCHEMA if schema is None else schema
+    date_formats = INGESTION_DATE_FORMATS if date_formats is None else date_formats
+
+    if engine == 'pyarrow':
+        # pandas' pyarrow engine infers the types before casting them,
+        # so the column types are handed to pyarrow directly
+        table = pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(encoding=encoding),
+            parse_options=pa_csv.ParseOptions(delimiter=sep),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=list(schema),
+                column_types=_get_arrow_types(schema, date_formats),
+                strings_can_be_null=True
+            )
+        )
+        df = table.to_pandas()
+        table = None
+    else:
+        df = pd.read_csv(
+            file_path,
+            sep=sep,
+            encoding=encoding,
+            engine=engine,
+            usecols=list(schema),
+            dtype=_get_read_dtypes(schema, date_formats),
+            **kwargs
+        )
+    df = apply_ingestion_schema(df, schema, date_formats)
+    bg_logger.info(
+        "CSV file read into DataFrame in %s (%.2f MB)",
+        str(datetime.now() - start_time),
+        df.memory_usage(deep=True).sum() / 1024 ** 2
+    )
+    return df
+
+
+def concat_ingestion_frames(
+    frames: list,
+    schema: dict = None,
+    ignore_index: bool = True
+) -> pd.DataFrame:
+    """
+    Concatenates typed frames (e.g. one per archive) into a single frame,
+    keeping the categorical columns as categoricals over the union of their categories.
+    Args:
+        frames: DataFrames typed by the schema.
+        schema: Mapping of column names to dtypes (defaults to INGESTION_SCHEMA).
+        ignore_index: If False, keeps the indexes of the frames.
+    Returns:
+        The concatenated DataFrame.
+    """
+    schema = INGESTION_SCHEMA if schema is None else schema
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True) if ignore_index else frames[0]
+
+    for column, dtype in schema.items():
+        if dtype != 'category':
+            continue
+        categories = union_categoricals(
+            [frame[column] for frame in frames], ignore_order=True
+        ).categories
+        for frame in frames:
+            frame[column] = frame[column].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=ignore_index)
+
+
+def _get_source_size(file_path) -> int:
+    """
+    Returns the size in bytes of a CSV file path or seekable stream.
+    """
+    if isinstance(file_path, (str, os.PathLike)):
+        return os.path.getsize(file_path)
+    if hasattr(file_path, 'getbuffer'):
+        return file_path.getbuffer().nbytes
+    position = file_path.tell()
+    size = file_path.seek(0, os.SEEK_END)
+    file_path.seek(position)
+    return size
+
+
+def iter_csv_invoice_partitions(
+    bg_logger,
+    file_path,
+    memory_ceiling_mb: int,
+    scratch_dir: str = None,
+    schema: dict = None,
+    date_formats: dict = None,
+    **kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams a CSV file in row batches and yields it back partitioned on `Invoice`,
+    so that every line of an invoice lands in the same partition and each
+    partition fits, with the stages temporaries, under the memory ceiling.
+
+    Invoices are not guaranteed to be contiguous on the source, so batches are
+    hash-partitioned on `Invoice` and spilled to compressed Parquet files on a
+    scratch directory, then read back one partition at a time.
+
+    Args:
+        bg_logger: Logger instance for logging.
+        file_path: Path to the CSV file or a file-like stream of it.
+        memory_ceiling_mb: Memory ceiling, in MB, for a partition going through stages I-III.
+        scratch_dir: Base directory of the spilled partitions (system temp dir if None).
+        schema: Mapping of column names to dtypes (defaults to INGESTION_SCHEMA).
+        date_formats: Mapping of datetime columns to their format (defaults to INGESTION_DATE_FORMATS).
+        kwargs: Additional arguments for reading the CSV file.
+    Yields:
+        DataFrames holding whole invoices, keeping the original row index.
+    """
+    start_time = datetime.now()
+    schema = INGESTION_SCHEMA if schema is None else schema
+    date_formats = INGESTION_DATE_FORMATS if date_formats is None else date_formats
+    source_size = _get_source_size(file_path)
+    # the pyarrow engine does not read in chunks
+    reader = pd.read_csv(
         file_path,
+        chunksize=_CHUNK_SAMPLE_ROWS,
+        usecols=list(schema),
+        dtype=_get_read_dtypes(schema, date_formats),
         **kwargs
     )
-    bg_logger.info("CSV file read into DataFrame in %s", str(datetime.now() - start_time))
-    return df
+
+    with reader:
+        # estimate the partition size from a sample of rows
+        sample = reader.get_chunk(_CHUNK_SAMPLE_ROWS)
+        frame_row_bytes = sample.memory_usage(deep=True).sum() / max(len(sample), 1)
+        csv_row_bytes = len(sample.to_csv(index=False).encode()) / max(len(sample), 1)
+        partition_rows = max(
+            int(memory_ceiling_mb * 1024 ** 2 / (frame_row_bytes * _STAGE_MEMORY_FACTOR)),
+            _CHUNK_SAMPLE_ROWS
+        )
+        n_partitions = math.ceil(source_size / csv_row_bytes / partition_rows)
+        bg_logger.info(
+            "Chunked mode: %d partition(s) of ~%d rows under %d MB",
+            n_partitions, partition_rows, memory_ceiling_mb
+        )
+
+        if n_partitions <= 1:
+            yield apply_ingestion_schema(pd.concat([sample, *reader]), schema, date_formats)
+            return
+
+        with tempfile.TemporaryDirectory(dir=scratch_dir) as spill_dir:
+            batch = sample
+            batch_number = 0
+            while batch is not None:
+                partitions = pd.util.hash_pandas_object(
+                    batch['Invoice'], index=False
+                ) % n_partitions
+                for partition, piece in batch.groupby(partitions.values):
+                    piece.to_parquet(
+                        os.path.join(spill_dir, f"{partition}-{batch_number}.parquet"),
+                        compression='snappy'
+                    )
+                batch_number += 1
+                try:
+                    batch = reader.get_chunk(partition_rows)
+                except StopIteration:
+                    batch = None
+            bg_logger.info(
+                "Chunked mode: %d batches spilled in %s",
+                batch_number, str(datetime.now() - start_time)
+            )
+
+            for partition in range(n_partitions):
+                pieces = [
+                    pd.read_parquet(os.path.join(spill_dir, f"{partition}-{number}.parquet"))
+                    for number in range(batch_number)
+                    if os.path.exists(os.path.join(spill_dir, f"{partition}-{number}.parquet"))
+                ]
+                if pieces:
+                    # categories differ across pieces, so the schema is applied again
+                    yield apply_ingestion_schema(pd.concat(pieces), schema, date_formats)
+                pieces = None
 
 
 class PipelineTransformer:
     """
     A class responsible for applying transformation logic for different stages of the pipeline.
     """
-    def __init__(self, bg_logger, f_sanitize_text: Callable, f_sanitize_column_data: Callable):
+    def __init__(
+        self,
+        bg_logger,
+        f_sanitize_text: Callable,
+        f_sanitize_column_data: Callable,
+        exact_pair_matching: bool = False,
+        table_workers: int = None,
+        calendar: CalendarDimension = None,
+        key_registry: DimensionKeyRegistry = None,
+        validation_params: dict = None,
+        load_strategies: dict = None,
+        load_batch_size: int = None,
+        load_workers: int = 1,
+        load_partitions: int = None,
+        fingerprint_index: RowFingerprintIndex = None
+    ):
         """
         Initialize the PipelineTransformer.
 
         Args:
             f_sanitize_text: A callable function to normalize string columns.
             bg_logger: Logger instance for logging.
+            exact_pair_matching: If True, rules flagging lines related to flagged lines
+                match the exact (Invoice, StockCode) pair, instead of any flagged
+                Invoice and any flagged StockCode independently.
+            table_workers: Threads generating the warehouse tables
+                (default one per table, 1 generates them sequentially).
+            calendar: Calendar dimension joined to dim_time (e.g. persisted across runs).
+            key_registry: Registry of the keys already loaded into the warehouse,
+                so only new dimension members are emitted (the integer key mode
+                defaults to an in-memory one, synced from the warehouse).
+            validation_params: Arguments of validate_warehouse_sales_data (e.g. the
+                validation engine, its workers and chunk size).
+            load_strategies: Strategy loading each warehouse table, by table name
+                ('merge', 'bulk' or 'upsert', see LOAD_STRATEGIES; default DEFAULT_LOAD_STRATEGY).
+            load_batch_size: Rows per executemany call of the bulk loads.
+            load_workers: Tables (or partitions) loaded concurrently over the engine's
+                connection pool (1 loads them in order).
+            load_partitions: Partitions of the fact table, by invoice hash
+                (default load_workers).
+            fingerprint_index: Fingerprints of the rows already loaded into the warehouse,
+                so only new or changed rows are sent (None sends every row).
         """
         self.bg_logger = bg_logger
         self.f_sanitize_text = f_sanitize_text
         self.f_sanitize_column_data = f_sanitize_column_data
+        self.exact_pair_matching = exact_pair_matching
+        self.table_workers = table_workers
+        self.calendar = calendar
+        # integer surrogate ids must continue the ones already in the warehouse
+        if key_registry is None and SURROGATE_KEY_MODE == 'integer':
+            key_registry = DimensionKeyRegistry()
+        self.key_registry = key_registry
+        self.validation_params = validation_params or {}
+        self.load_strategies = load_strategies or {}
+        for table_name, strategy in self.load_strategies.items():
+            if strategy not in LOAD_STRATEGIES:
+                raise ValueError(f"Unknown load strategy for table '{table_name}': {strategy}")
+        self.load_batch_size = load_batch_size
+        self.load_workers = load_workers
+        self.load_partitions = load_partitions
+        self.fingerprint_index = fingerprint_index
+        self._key_index = None
+        self.description_classifier = DescriptionClassifier(DESCRIPTION_KEYWORD_RULES)
+        self.test_data_classifier = DescriptionClassifier(
+            {'test_data': DESCRIPTION_KEYWORD_RULES['test_data']}
+        )
+
+    def get_key_index(self, df: pd.DataFrame) -> InvoiceKeyIndex:
+        """
+        Returns the (Invoice, StockCode) key index of the DataFrame,
+        built once and shared across stages while the rows are the same.
+        """
+        if self._key_index is None or not self._key_index.is_for(df):
+            start_time = datetime.now()
+            self._key_index = InvoiceKeyIndex(df)
+            self.bg_logger.info("Key index built in %s", str(datetime.now() - start_time))
+        return self._key_index
 
     def stage_1(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -71,10 +396,11 @@ class PipelineTransformer:
         """
         start_time = datetime.now()
 
-        # Specialized string dtypes
-        df['Country'] = df['Country'].apply(self.f_sanitize_text)
-        # correct acronyms and normalizing location names
-        df['Country'] = df['Country'].replace(NORMATIZE_LOCATION_MAP)
+        # Specialized string dtypes, correcting acronyms and normalizing location names
+        # once per distinct location
+        df['Country'] = normalize_text_column(
+            df['Country'], self.f_sanitize_text, NORMATIZE_LOCATION_MAP
+        )
         self.bg_logger.info("Stage I Country Column transformed")
 
         # flag entry errors
@@ -85,102 +411,63 @@ class PipelineTransformer:
         ).astype(int)
         self.bg_logger.info("Stage I Customer ID column transformed")
 
-        # filter negative and zero prices as well as possible effective sales
-        _non_and_zero_prices_df = df.query("Price <= 0")
-        _possile_effective_sales = df.query("Price > 0")
-
-        # seek for possible product returns
-        _possible_product_returns = _non_and_zero_prices_df.merge(
-            _possile_effective_sales,
-            on=['Invoice', 'StockCode'],
-            suffixes=('_return', '_sale')
-        )
-
-        _possile_effective_sales = None
-        _non_and_zero_prices_df = None
+        _key_index = self.get_key_index(df)
 
-        # filter out possible product returns
-        _possible_product_returns = _possible_product_returns.query(
-            "Quantity_return < Quantity_sale"
-        )
+        # flag product returns, matching zero and negative prices
+        # against possible effective sales of the same invoice and stock code
+        df['product_return'] = flag_product_returns(df, _key_index)
 
-        # flag product returns
-        df['product_return'] = df.apply(
-            lambda x: 1 if x['Invoice']
-            in _possible_product_returns.loc[:, 'Invoice'].values else 0,
-            axis=1
-        )
+        # classify descriptions in a single pass over the distinct values
+        _description_flags = self.description_classifier.classify(df['Description'])
 
-        _possible_product_returns = None
-
-        # Flag cloud lost products based on the pattern
-        # Create the regex pattern to match only at the start of the string
-        _pattern = r'^(?:' + '|'.join(escaped_keywords) + r')\b'
-        df['lost_sales'] = df['Description'].str.contains(
-            _pattern,
-            case=False,
-            na=False
-        ).astype(int)
-        _pattern = None
+        # Flag cloud lost products, matching only at the start of the string
+        df['lost_sales'] = _description_flags['lost_sales']
         self.bg_logger.info("Stage I Price column transformed")
 
-        _pattern = 'debt|credit| fee'
-        _fin_details_df = df[df['Description'].str.contains(_pattern, na=False, case=False)]
-
         # flag financial details
         df.loc[
-            (df['Invoice'].isin(_fin_details_df['Invoice'])) &
-            (df['StockCode'].isin(_fin_details_df['StockCode'])),
+            _key_index.matches(
+                _description_flags['financial_details'], self.exact_pair_matching
+            ),
             'financial_details'
         ] = 1
 
         # flag adjustment and maintenance
-        _pattern = 'adjust|update'
         df.loc[
-            df['Description'].str.contains(_pattern, na=False, case=False),
+            _description_flags['maintenance_adjustment'].astype(bool),
             'maintenance_adjustment'
         ] = 1
-        _pattern = None
+        _description_flags = None
 
         self.bg_logger.info("Stage I Description column transformed")
 
         # filter out gift products and bank charges
-        _gift_df = df[
-            df['StockCode'].astype(str).str.contains(
-                'gift', na=False, regex=True, case=False
-            )
-        ]
-        _charges_df = df[
-            df['StockCode'].astype(str).str.contains(
-                'charges', na=False, regex=True, case=False
-            )
-        ]
+        _is_gift = df['StockCode'].astype(str).str.contains(
+            'gift', na=False, regex=True, case=False
+        )
+        _is_charges = df['StockCode'].astype(str).str.contains(
+            'charges', na=False, regex=True, case=False
+        )
 
         # flag possible returns
-        _return_sales_df = df[
-            df['Quantity'] < 0
-        ]
         df.loc[
-            df['Invoice'].isin(_return_sales_df['Invoice']),
+            _key_index.invoice_matches(df['Quantity'] < 0),
             'product_return'
         ] = 1
-        _return_sales_df = None
 
         # flagging lost sales for gift products
         df.loc[
-            (df['Invoice'].isin(_gift_df['Invoice'])) &
-            (df['StockCode'].isin(_gift_df['StockCode'])),
+            _key_index.matches(_is_gift, self.exact_pair_matching),
             'lost_sales'
         ] = 1
-        _gift_df = None
+        _is_gift = None
 
         # flagging bank charges as financial details
         df.loc[
-            (df['Invoice'].isin(_charges_df['Invoice'])) &
-            (df['StockCode'].isin(_charges_df['StockCode'])),
+            _key_index.matches(_is_charges, self.exact_pair_matching),
             'financial_details'
         ] = 1
-        _charges_df = None
+        _is_charges = None
         self.bg_logger.info("Stage I StockCode column transformed")
 
         self.bg_logger.info("Stage I completed in %s", str(datetime.now() - start_time))
@@ -196,22 +483,22 @@ class PipelineTransformer:
         """
         start_time = datetime.now()
 
-        # filtering test data
-        _pattern = 'test|tste|tst'
-        _test_data = df[
-            df.astype(str)
-            .apply(lambda col: col.str.contains(_pattern, case=False, regex=True))
-            .any(axis=1)
-        ]
-        _pattern = None
+        # filtering test data, scanning only the text columns
+        # once per distinct value, descriptions through the (cached) classifier
+        _is_test_data = np.zeros(len(df), dtype=bool)
+        for column in TEST_DATA_COLUMNS:
+            _classifier = (
+                self.description_classifier if column == 'Description'
+                else self.test_data_classifier
+            )
+            _is_test_data |= _classifier.classify(df[column])['test_data'].to_numpy(dtype=bool)
 
         # updating entry errors
         df.loc[
-            (df['Invoice'].isin(_test_data['Invoice'])) &
-            (df['StockCode'].isin(_test_data['StockCode'])),
+            self.get_key_index(df).matches(_is_test_data, self.exact_pair_matching),
             'entry_errors'
         ] = 1
-        _test_data = None
+        _is_test_data = None
 
         self.bg_logger.info("Stage II General columns updated")
 
@@ -227,6 +514,8 @@ class PipelineTransformer:
             The transformed DataFrame.
         """
         start_time = datetime.now()
+        # rows are filtered from here on, releasing the stages I-II key index
+        self._key_index = None
 
         # removing entry errors
         df = df[~df['entry_errors'].astype(bool)]
@@ -249,12 +538,22 @@ class PipelineTransformer:
         # specialized DTYPES
         df['quantity'] = pd.to_numeric(df['quantity'], errors='coerce')
         df['price'] = pd.to_numeric(df['price'], errors='coerce')
-        df['price'] = df['price'].replace({np.nan: None})
 
-        # treating different date formats and converting to ISO 8601
-        df['invoice_date'] = pd.to_datetime(df['invoice_date'], errors='coerce')
-        df['invoice_date'] = df['invoice_date'].dt.strftime('%Y-%m-%dT%H:%M:%S')
-        self.bg_logger.info("Stage III Data formatted")
+        # treating different date formats, kept as datetime64 until the output boundaries
+        if not pd.api.types.is_datetime64_any_dtype(df['invoice_date']):
+            df['invoice_date'] = pd.to_datetime(df['invoice_date'], errors='coerce')
+
+        # compact dtype plan
+        _memory_before = df.memory_usage(deep=True).sum()
+        df = df.astype(STAGE_III_DTYPES)
+        self.bg_logger.info(
+            "Stage III Data formatted, memory per column:\n%s",
+            get_memory_report(df).to_string()
+        )
+        self.bg_logger.info(
+            "Stage III memory reduced from %.2f MB to %.2f MB",
+            _memory_before / 1024 ** 2, df.memory_usage(deep=True).sum() / 1024 ** 2
+        )
 
         df.drop_duplicates(inplace=True)
         self.bg_logger.info("Stage III Duplicates removed")
@@ -262,6 +561,76 @@ class PipelineTransformer:
         self.bg_logger.info("Stage III completed in %s", str(datetime.now() - start_time))
         return df
 
+    def run_chunked(
+        self,
+        file_path,
+        memory_ceiling_mb: int,
+        scratch_dir: str = None,
+        **kwargs
+    ) -> pd.DataFrame:
+        """
+        Applies stages I, II and III over bounded-memory partitions of the CSV file,
+        partitioned on `Invoice` so the invoice-level rules see every line of an invoice.
+
+        Note: rules matching `StockCode` independently of the `Invoice`
+        (financial details, gifts, bank charges and test data) only see the
+        stock codes flagged within the same partition.
+
+        Args:
+            file_path: Path to the CSV file or a file-like stream of it.
+            memory_ceiling_mb: Memory ceiling, in MB, for a partition going through stages I-III.
+                It does not cover a file-like stream already held in memory nor the
+                returned stage III DataFrame (every partition, with compact dtypes).
+            scratch_dir: Base directory of the spilled partitions (system temp dir if None).
+            kwargs: Additional arguments for reading the CSV file.
+        Returns:
+            The stage III DataFrame.
+        """
+        start_time = datetime.now()
+        stage_iii_parts = []
+        for partition_df in iter_csv_invoice_partitions(
+            self.bg_logger, file_path, memory_ceiling_mb, scratch_dir, **kwargs
+        ):
+            stage_iii_parts.append(
+                self.stage_3(self.stage_2(self.stage_1(partition_df)))
+            )
+            self.bg_logger.info(
+                "Chunked mode: partition %d with %d rows processed",
+                len(stage_iii_parts), len(partition_df)
+            )
+            partition_df = None
+
+        df = concat_ingestion_frames(
+            stage_iii_parts, STAGE_III_DTYPES, ignore_index=False
+        ).sort_index()
+        stage_iii_parts = None
+        self.bg_logger.info("Chunked stages completed in %s", str(datetime.now() - start_time))
+        return df
+
+    def register_loaded_rows(self, table_name: str, df: pd.DataFrame) -> None:
+        """
+        Registers the keys and fingerprints of rows committed into the warehouse.
+
+        Args:
+            table_name: Warehouse table the rows were loaded into.
+            df: Rows of the table (or of one of its partitions).
+        """
+        if self.key_registry is not None:
+            self.key_registry.register_tables({table_name: df})
+        if self.fingerprint_index is not None:
+            self.fingerprint_index.register_tables({table_name: df})
+
+    def discard_failed_rows(self, table_name: str, df: pd.DataFrame) -> None:
+        """
+        Drops the fingerprints of a table whose load failed, so its rows are sent again.
+
+        Args:
+            table_name: Warehouse table the rows failed to load into.
+            df: Rows of the table (or of one of its partitions).
+        """
+        if self.fingerprint_index is not None:
+            self.fingerprint_index.discard(table_name)
+
     def generates_dw_tables(self, df: pd.DataFrame, engine: sqlalchemy.engine.Engine) -> None:
         """
         Applies the fourth stage of transformations to the data, maps to ORM models,
@@ -274,80 +643,82 @@ class PipelineTransformer:
         Returns:
             None
         """
-        # Create a session factory
-        Session = sessionmaker(bind=engine)
-
-        # Start a session
-        with Session() as session:
-            if not isinstance(session, sqlalchemy.orm.Session):
-                raise TypeError("Expected a SQLAlchemy Session object, got a different type.")
-
-            start_time = datetime.now()
-            self.bg_logger.info("Starting generation of Data Warehouse tables.")
-
-            try:
-                # Generate dimension and fact tables
-                _tables = generate_warehouse_sales_tables(self.bg_logger, df)
-                self.bg_logger.info("Generated warehouse tables: %s", list(_tables.keys()))
+        start_time = datetime.now()
+        self.bg_logger.info("Starting generation of Data Warehouse tables.")
 
-                # Validate generated tables
-                _generating_integrity_test = validate_warehouse_sales_data(
-                    self.bg_logger, _tables, validation_models
+        try:
+            # the key registry is synced from the warehouse when it has no local copy,
+            # or when its copy does not match the warehouse row counts anymore
+            if self.key_registry is not None and self.key_registry.refresh(engine):
+                self.bg_logger.info(
+                    "Key registry synced from the warehouse with %d keys.",
+                    len(self.key_registry.entries)
                 )
-                validate_data_integrity(self.bg_logger, _generating_integrity_test)
-
-                # Iterate over tables and insert/update data
-                for table_name, table_data in _tables.items():
-                    if table_name not in models_map:
-                        self.bg_logger.warning(
-                            "Table '%s' is not mapped to an ORM model. Skipping.", table_name
-                        )
-                        continue
-
-                    # Get the ORM model class
-                    model_class = models_map[table_name]
-                    self.bg_logger.info(
-                        "Inserting/updating records into '%s' using ORM model '%s'.",
-                        table_name, model_class.__name__
+
+            # Generate dimension and fact tables
+            _tables = generate_warehouse_sales_tables(
+                self.bg_logger, df,
+                max_workers=self.table_workers,
+                calendar=self.calendar,
+                key_registry=self.key_registry
+            )
+            self.bg_logger.info("Generated warehouse tables: %s", list(_tables.keys()))
+
+            # Skip dimension members already loaded on previous runs
+            if self.key_registry is not None:
+                _skipped = self.key_registry.filter_new_members(_tables)
+                self.bg_logger.info("Existing dimension members skipped: %s", _skipped)
+
+            # Skip rows loaded unchanged on previous runs, once the fingerprints of the
+            # tables changed outside of the pipeline (e.g. deleted rows) are dropped
+            if self.fingerprint_index is not None:
+                _discarded = self.fingerprint_index.validate(engine)
+                if _discarded:
+                    self.bg_logger.warning(
+                        "Row fingerprints dropped, tables changed in the warehouse: %s",
+                        _discarded
                     )
+                _unchanged = self.fingerprint_index.filter_changed_rows(_tables)
+                self.bg_logger.info("Unchanged rows skipped: %s", _unchanged)
 
-                    try:
-                        # Transform the DataFrame into ORM model instances
-                        records = [
-                            model_class(**row) for row in table_data.to_dict(orient="records")
-                        ]
-
-                        # Perform an upsert (insert or update)
-                        for record in records:
-                            session.merge(record)  # Merge handles both insert and update
-
-                        session.commit()
-                        self.bg_logger.info(
-                            "Inserted/updated %d records into '%s' successfully.",
-                            len(records), table_name
-                        )
-                    except exc.IntegrityError as e:
-                        session.rollback()
-                        self.bg_logger.error(
-                            "Integrity error while inserting/updating data into '%s': %s",
-                            table_name, str(e)
-                        )
-                        raise
-                    except Exception as e:
-                        session.rollback()
-                        self.bg_logger.error(
-                            "Error inserting/updating data into '%s': %s", table_name, str(e)
-                        )
-                        raise
-            finally:
-                self.bg_logger.info(
-                    "Stage IV Data Warehouse tables generated and inserted/updated in %s",
-                    datetime.now() - start_time
-                )
+            # Validate generated tables
+            _generating_integrity_test = validate_warehouse_sales_data(
+                self.bg_logger, _tables, validation_models, **self.validation_params
+            )
+            validate_data_integrity(self.bg_logger, _generating_integrity_test)
+
+            # Insert/update the tables, dimensions before the fact table; the keys and
+            # fingerprints of every committed table are registered for the next runs
+            _loaded = load_warehouse_tables(
+                self.bg_logger, engine, _tables,
+                strategies=self.load_strategies,
+                batch_size=self.load_batch_size,
+                max_workers=self.load_workers,
+                partitions=self.load_partitions,
+                on_loaded=self.register_loaded_rows,
+                on_failed=self.discard_failed_rows
+            )
+            self.bg_logger.info("Inserted/updated records: %s", _loaded)
+        finally:
+            # saved even when a load failed, holding the tables committed before it
+            if self.key_registry is not None and self.key_registry.is_loaded:
+                self.key_registry.save()
+            if self.fingerprint_index is not None:
+                try:
+                    self.fingerprint_index.update_row_counts(engine)
+                except sqlalchemy.exc.SQLAlchemyError as e:
+                    # stale watermarks drop the fingerprints of their tables on the next run
+                    self.bg_logger.warning("Row fingerprint watermarks not updated: %s", e)
+                self.fingerprint_index.save()
+            self.bg_logger.info(
+                "Stage IV Data Warehouse tables generated and inserted/updated in %s",
+                datetime.now() - start_time
+            )
 
     def save_parquet_stage(
         self, df: pd.DataFrame,
         file_path: str,
+        date_format: str = OUTPUT_DATETIME_FORMAT,
         **kwargs
     ):
         """
@@ -355,9 +726,18 @@ class PipelineTransformer:
         Args:
             df: DataFrame to be saved.
             file_path: Path to save the Parquet file.
+            date_format: Format of the datetime columns in the file
+                (None keeps them as Parquet timestamps).
             kwargs: Additional arguments for saving the Parquet file.
         """
         start_time = datetime.now()
+        if date_format is not None:
+            _date_columns = df.select_dtypes(include=['datetime', 'datetimetz']).columns
+            if len(_date_columns):
+                df = df.assign(**{
+                    column: df[column].dt.strftime(date_format)
+                    for column in _date_columns
+                })
         df.to_parquet(file_path, **kwargs)
         self.bg_logger.info(
             "DataFrame saved to Parquet in %s", 
@@ -0,0 +1,464 @@
+"""
+This module holds the functions loading the warehouse tables into the database.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple, Type
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+import sqlalchemy
+import sqlalchemy.orm
+import sqlalchemy.exc as exc
+from sqlalchemy import and_, exists, insert, or_, select, update
+from sqlalchemy.orm import sessionmaker
+
+from infra.pipeline.pipeline_metadata import (
+    LOAD_STRATEGIES,
+    DEFAULT_LOAD_STRATEGY,
+    LOAD_PARTITION_COLUMNS,
+    LOAD_DEPENDENCIES,
+    models_map
+)
+
+
+# rows sent to the database on each executemany call of the bulk loader
+_LOAD_BATCH_SIZE = 10_000
+# retries of a table (or partition) load failing on a transient database error
+_LOAD_RETRIES = 3
+# seconds waited before a retry, multiplied by the attempt number
+_LOAD_RETRY_BACKOFF = 1.0
+
+
+def _log_throughput(bg_logger, table_name: str, strategy: str, rows: int, start_time: datetime):
+    """
+    Logs the rows loaded into a table and the load throughput (rows/second).
+    """
+    _elapsed = (datetime.now() - start_time).total_seconds()
+    bg_logger.info(
+        "Loaded %d rows into '%s' (%s) in %.2fs, %.0f rows/s.",
+        rows, table_name, strategy, _elapsed, rows / _elapsed if _elapsed else float(rows)
+    )
+
+def iter_load_batches(df: pd.DataFrame, batch_size: int = _LOAD_BATCH_SIZE):
+    """
+    Yields the rows of a DataFrame as lists of parameter dicts, in batches,
+    with missing values (NaN, NaT, NA) sent as NULL.
+    """
+    for start in range(0, len(df), batch_size):
+        _batch = df.iloc[start:start + batch_size].astype(object)
+        yield _batch.where(_batch.notna(), None).to_dict(orient="records")
+
+def bulk_insert_table(
+    bg_logger,
+    connection: sqlalchemy.engine.Connection,
+    table: sqlalchemy.Table,
+    df: pd.DataFrame,
+    batch_size: int = _LOAD_BATCH_SIZE
+) -> int:
+    """
+    Inserts the rows of a DataFrame with Core insert() statements, executed in batches
+    (executemany, fast_executemany with pyodbc), without building ORM objects.
+
+    Rows sharing a primary key keep the last one, as merging them would; rows already
+    in the table are not updated: they violate its primary key.
+
+    Args:
+        bg_logger: Logger for logging the load throughput.
+        connection: Connection running the inserts (the caller commits them).
+        table: Table receiving the rows.
+        df: Rows to insert, with the table's column names.
+        batch_size: Rows per executemany call.
+
+    Returns:
+        The number of rows inserted.
+    """
+    start_time = datetime.now()
+    _keys = [column.name for column in table.primary_key.columns]
+    _rows = len(df)
+    df = df.drop_duplicates(subset=_keys, keep='last')
+    if len(df) < _rows:
+        bg_logger.warning(
+            "%d rows of '%s' share a primary key with a later row and were collapsed.",
+            _rows - len(df), table.name
+        )
+
+    _statement = table.insert()
+    for records in iter_load_batches(df, batch_size):
+        connection.execute(_statement, records)
+    _log_throughput(bg_logger, table.name, 'bulk', len(df), start_time)
+    return len(df)
+
+def create_staging_table(
+    connection: sqlalchemy.engine.Connection,
+    table: sqlalchemy.Table,
+    columns: List[str]
+) -> sqlalchemy.Table:
+    """
+    Creates an empty staging copy of a table (the given columns and its primary key),
+    in the table's schema, under a name unique to the load.
+    """
+    _staging = sqlalchemy.Table(
+        f"stg_{table.name}_{uuid4().hex[:12]}",
+        sqlalchemy.MetaData(),
+        *[
+            sqlalchemy.Column(
+                column.name, column.type,
+                primary_key=column.primary_key, autoincrement=False
+            )
+            for column in table.columns if column.name in columns
+        ],
+        schema=table.schema
+    )
+    _staging.create(connection)
+    return _staging
+
+def _merge_statement(
+    connection: sqlalchemy.engine.Connection,
+    table: sqlalchemy.Table,
+    staging: sqlalchemy.Table
+) -> str:
+    """
+    Returns the T-SQL MERGE applying the staging rows to the table: missing rows are
+    inserted and rows with a changed (null-safe, via EXCEPT) column are updated.
+    """
+    _preparer = connection.dialect.identifier_preparer
+    _keys = [_preparer.quote(column.name) for column in staging.primary_key.columns]
+    _columns = [_preparer.quote(column.name) for column in staging.columns]
+    _values = [
+        _preparer.quote(column.name) for column in staging.columns if not column.primary_key
+    ]
+
+    _statement = (
+        f"MERGE INTO {_preparer.format_table(table)} WITH (HOLDLOCK) AS t "
+        f"USING {_preparer.format_table(staging)} AS s "
+        f"ON {' AND '.join(f't.{key} = s.{key}' for key in _keys)} "
+    )
+    if _values:
+        _statement += (
+            f"WHEN MATCHED AND EXISTS ("
+            f"SELECT {', '.join(f's.{column}' for column in _values)} EXCEPT "
+            f"SELECT {', '.join(f't.{column}' for column in _values)}"
+            f") THEN UPDATE SET {', '.join(f'{column} = s.{column}' for column in _values)} "
+        )
+    return _statement + (
+        f"WHEN NOT MATCHED BY TARGET THEN INSERT ({', '.join(_columns)}) "
+        f"VALUES ({', '.join(f's.{column}' for column in _columns)});"
+    )
+
+def _apply_staging_rows(
+    connection: sqlalchemy.engine.Connection,
+    table: sqlalchemy.Table,
+    staging: sqlalchemy.Table
+) -> Tuple[int, int]:
+    """
+    Applies the staging rows to the table, set-based: one MERGE on MSSQL, otherwise
+    an update of the changed rows followed by an insert of the missing ones.
+
+    Returns:
+        The rows (inserted, updated); a MERGE only reports the rows it affected,
+        returned as (affected, None).
+    """
+    if connection.dialect.name == 'mssql':
+        _result = connection.execute(
+            sqlalchemy.text(_merge_statement(connection, table, staging))
+        )
+        return _result.rowcount, None
+
+    _match = and_(*[
+        table.c[column.name] == column for column in staging.primary_key.columns
+    ])
+    _values = [column for column in staging.columns if not column.primary_key]
+    _updated = 0
+    if _values:
+        _updated = connection.execute(
+            update(table)
+            .where(_match)
+            .where(or_(*[table.c[column.name].is_distinct_from(column) for column in _values]))
+            .values({column.name: column for column in _values})
+        ).rowcount
+    _inserted = connection.execute(
+        insert(table).from_select(
+            [column.name for column in staging.columns],
+            select(*staging.columns).where(~exists().where(_match))
+        )
+    ).rowcount
+    return _inserted, _updated
+
+def upsert_table(
+    bg_logger,
+    connection: sqlalchemy.engine.Connection,
+    table: sqlalchemy.Table,
+    df: pd.DataFrame,
+    batch_size: int = _LOAD_BATCH_SIZE
+) -> int:
+    """
+    Inserts or updates the rows of a DataFrame set-based: they are bulk inserted into a
+    staging table (in the table's schema, dropped afterwards), then applied to the table
+    in one MERGE (insert-missing plus update-changed out of MSSQL). Reloading the same
+    rows changes nothing, so loads are idempotent. A failed load is rolled back with its
+    staging table (DDL is transactional on MSSQL); dropping it within the failed
+    transaction is only attempted, never hiding the original error.
+
+    Args:
+        bg_logger: Logger for logging the load throughput.
+        connection: Connection running the load (the caller commits it).
+        table: Table receiving the rows.
+        df: Rows to upsert, with the table's column names.
+        batch_size: Rows per executemany call into the staging table.
+
+    Returns:
+        The number of rows staged.
+    """
+    start_time = datetime.now()
+    _staging = create_staging_table(connection, table, list(df.columns))
+    try:
+        _staged = bulk_insert_table(bg_logger, connection, _staging, df, batch_size)
+        _inserted, _updated = _apply_staging_rows(connection, table, _staging)
+    except Exception:
+        # the transaction may be doomed, its rollback drops the staging table anyway
+        try:
+            _staging.drop(connection)
+        except exc.SQLAlchemyError as e:
+            bg_logger.warning(
+                "Staging table '%s' not dropped after a failed load: %s", _staging.name, str(e)
+            )
+        raise
+    _staging.drop(connection)
+
+    if _updated is None:
+        bg_logger.info(
+            "Merged %d staged rows into '%s' (%d affected).", _staged, table.name, _inserted
+        )
+    else:
+        bg_logger.info(
+            "Merged %d staged rows into '%s' (%d inserted, %d updated).",
+            _staged, table.name, _inserted, _updated
+        )
+    _log_throughput(bg_logger, table.name, 'upsert', _staged, start_time)
+    return _staged
+
+def merge_table(
+    bg_logger,
+    session: sqlalchemy.orm.Session,
+    model_class: Type,
+    df: pd.DataFrame
+) -> int:
+    """
+    Inserts or updates the rows of a DataFrame, merging one ORM object per row.
+
+    Args:
+        bg_logger: Logger for logging the load throughput.
+        session: Session merging the rows (the caller commits them).
+        model_class: ORM model of the table.
+        df: Rows to merge, with the model's attribute names.
+
+    Returns:
+        The number of rows merged.
+    """
+    start_time = datetime.now()
+    records = [model_class(**row) for row in df.to_dict(orient="records")]
+    for record in records:
+        session.merge(record)  # Merge handles both insert and update
+    session.flush()
+    _log_throughput(bg_logger, model_class.__tablename__, 'merge', len(records), start_time)
+    return len(records)
+
+def load_table(
+    bg_logger,
+    session: sqlalchemy.orm.Session,
+    model_class: Type,
+    df: pd.DataFrame,
+    strategy: str = DEFAULT_LOAD_STRATEGY,
+    batch_size: int = None
+) -> int:
+    """
+    Loads the rows of a DataFrame into the table of an ORM model, with the given strategy
+    ('merge', 'bulk' or 'upsert', see LOAD_STRATEGIES), within the session transaction.
+    Bulk and upsert loads send batch_size rows per executemany call
+    (default _LOAD_BATCH_SIZE).
+
+    Returns:
+        The number of rows loaded.
+    """
+    if strategy not in LOAD_STRATEGIES:
+        raise ValueError(f"Unknown load strategy: {strategy}")
+    if strategy == 'bulk':
+        return bulk_insert_table(
+            bg_logger, session.connection(), model_class.__table__, df,
+            batch_size or _LOAD_BATCH_SIZE
+        )
+    if strategy == 'upsert':
+        return upsert_table(
+            bg_logger, session.connection(), model_class.__table__, df,
+            batch_size or _LOAD_BATCH_SIZE
+        )
+    return merge_table(bg_logger, session, model_class, df)
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Tells whether a database error is transient (deadlock, timeout, lost connection),
+    so its load can be retried, rather than caused by the data or the statement.
+    """
+    return isinstance(error, exc.DBAPIError) and not isinstance(
+        error, (exc.IntegrityError, exc.ProgrammingError, exc.DataError)
+    )
+
+def _load_partition(
+    bg_logger,
+    engine: sqlalchemy.engine.Engine,
+    label: str,
+    model_class: Type,
+    df: pd.DataFrame,
+    strategy: str,
+    batch_size: int,
+    retries: int
+) -> int:
+    """
+    Loads a table (or a partition of it) in its own session and transaction,
+    committed on success and retried from scratch on transient errors.
+    """
+    Session = sessionmaker(bind=engine)
+    for attempt in range(1, retries + 2):
+        try:
+            with Session() as session:
+                _loaded = load_table(bg_logger, session, model_class, df, strategy, batch_size)
+                session.commit()
+            return _loaded
+        except exc.DBAPIError as e:
+            if attempt > retries or not _is_retryable(e):
+                bg_logger.error("Error loading %s: %s", label, str(e))
+                raise
+            bg_logger.warning(
+                "Loading %s failed (attempt %d of %d), retrying: %s",
+                label, attempt, retries + 1, str(e)
+            )
+            time.sleep(_LOAD_RETRY_BACKOFF * attempt)
+
+def partition_table(df: pd.DataFrame, column: str, partitions: int) -> List[pd.DataFrame]:
+    """
+    Splits a DataFrame into (up to) the given number of partitions by hash of a column,
+    so rows sharing a value of the column always land in the same partition.
+    """
+    if partitions <= 1 or column not in df.columns or df.empty:
+        return [df]
+    _buckets = pd.util.hash_pandas_object(df[column], index=False).to_numpy() % partitions
+    return [df[_buckets == bucket] for bucket in np.unique(_buckets)]
+
+def get_load_levels(table_names: List[str]) -> List[List[str]]:
+    """
+    Orders the tables in levels by their foreign keys (and LOAD_DEPENDENCIES): each level
+    only references tables of the previous ones, so the tables of a level can be loaded
+    concurrently.
+    """
+    _tables = {models_map[name].__table__.fullname: name for name in table_names}
+    _pending = {
+        name: ({
+            _tables[constraint.referred_table.fullname]
+            for constraint in models_map[name].__table__.foreign_key_constraints
+            if constraint.referred_table.fullname in _tables
+        } | {
+            dependency for dependency in LOAD_DEPENDENCIES.get(name, ())
+            if dependency in table_names
+        }) - {name}
+        for name in table_names
+    }
+    levels = []
+    while _pending:
+        _level = [name for name, references in _pending.items() if not references]
+        if not _level:
+            raise ValueError(f"Circular foreign keys between tables: {list(_pending)}")
+        levels.append(_level)
+        _pending = {
+            name: references - set(_level)
+            for name, references in _pending.items() if name not in _level
+        }
+    return levels
+
+def load_warehouse_tables(
+    bg_logger,
+    engine: sqlalchemy.engine.Engine,
+    tables: Dict[str, pd.DataFrame],
+    strategies: Dict[str, str] = None,
+    batch_size: int = None,
+    max_workers: int = 1,
+    partitions: int = None,
+    retries: int = _LOAD_RETRIES,
+    on_loaded: Callable[[str, pd.DataFrame], None] = None,
+    on_failed: Callable[[str, pd.DataFrame], None] = None
+) -> Dict[str, int]:
+    """
+    Loads the warehouse tables in foreign key order (see get_load_levels): the tables of
+    each level are loaded concurrently over the engine's connection pool, once every
+    table they reference is committed. Tables with a partition column (see
+    LOAD_PARTITION_COLUMNS, e.g. the fact table by invoice hash) are loaded in
+    partitions, each one committed and retried on its own.
+
+    Rows are reported to on_loaded as soon as their table (or partition) is committed,
+    or to on_failed once its load failed, on the calling thread, so a failed load still
+    reports the tables committed before it.
+
+    Args:
+        bg_logger: Logger for logging the load progress and throughput.
+        engine: Engine whose connection pool runs the loads (sized for max_workers).
+        tables: Tables to load, by name (tables without an ORM model are skipped).
+        strategies: Load strategy of each table (default DEFAULT_LOAD_STRATEGY).
+        batch_size: Rows per executemany call of the bulk and upsert loads.
+        max_workers: Tables or partitions loaded concurrently (1 loads them in order).
+        partitions: Partitions of the partitioned tables (default max_workers).
+        retries: Retries of a table or partition load failing on a transient error.
+        on_loaded: Called with the table name and the rows of every committed table or partition.
+        on_failed: Called with the table name and the rows of every failed table or partition.
+
+    Returns:
+        Dict[str, int]: Rows loaded into each table.
+    """
+    strategies = strategies or {}
+    partitions = partitions or max_workers
+    for table_name in tables:
+        if table_name not in models_map:
+            bg_logger.warning("Table '%s' is not mapped to an ORM model. Skipping.", table_name)
+
+    loaded = {}
+    start_time = datetime.now()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for level in get_load_levels([name for name in tables if name in models_map]):
+            _futures = {}
+            for table_name in level:
+                _parts = partition_table(
+                    tables[table_name], LOAD_PARTITION_COLUMNS.get(table_name), partitions
+                )
+                for number, part in enumerate(_parts, start=1):
+                    _label = table_name if len(_parts) == 1 else (
+                        f"{table_name} (partition {number} of {len(_parts)})"
+                    )
+                    _futures[executor.submit(
+                        _load_partition, bg_logger, engine, _label, models_map[table_name],
+                        part, strategies.get(table_name, DEFAULT_LOAD_STRATEGY),
+                        batch_size, retries
+                    )] = (table_name, part)
+
+            # every load of the level completes (or fails) before the next level starts
+            _errors = []
+            for future in as_completed(_futures):
+                table_name, part = _futures[future]
+                try:
+                    loaded[table_name] = loaded.get(table_name, 0) + future.result()
+                except Exception as e:  # pylint: disable=broad-except
+                    _errors.append(e)
+                    if on_failed is not None:
+                        on_failed(table_name, part)
+                    continue
+                if on_loaded is not None:
+                    on_loaded(table_name, part)
+            if _errors:
+                raise _errors[0]
+            bg_logger.info("Loaded tables %s in %s", level, str(datetime.now() - start_time))
+
+    bg_logger.info(
+        "Warehouse tables loaded (%d rows) in %s",
+        sum(loaded.values()), str(datetime.now() - start_time)
+    )
+    return loaded
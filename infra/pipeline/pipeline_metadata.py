@@ -8,8 +8,8 @@ from infra.models.dims_integrity import (
     DimLocationValidation,
     DimCustomerValidation,
     DimProductValidation,
-    DimMetadataTransactionValidation
-
+    DimMetadataTransactionValidation,
+    SurrogateKeyMapValidation
 )
 from infra.models.facts_integrity import (
     FactSalesTransactionValidation
@@ -19,11 +19,13 @@ from infra.models.dim import (
     DimLocation,
     DimCustomer,
     DimProduct,
-    DimMetadataTransaction
+    DimMetadataTransaction,
+    SurrogateKeyMap
 )
 from infra.models.fact import (
     FactSalesTransaction
 )
+from infra.models import SURROGATE_KEY_MODE
 
 
 NORMATIZE_LOCATION_MAP = {
@@ -45,6 +47,48 @@ CLOUD_LOST_PRODUCTS_WORDS = [
     'eurobargain', 'broken', 'poor quality', '?sold individually?',
 ]
 
+TEST_DATA_WORDS = ['test', 'tste', 'tst']
+
+# Keyword rules classifying descriptions, as label: (keywords, anchored at the start).
+# Every rule is evaluated in a single pass, once per distinct description.
+DESCRIPTION_KEYWORD_RULES = {
+    'lost_sales': (CLOUD_LOST_PRODUCTS_WORDS, True),
+    'financial_details': (['debt', 'credit', ' fee'], False),
+    'maintenance_adjustment': (['adjust', 'update'], False),
+    'test_data': (TEST_DATA_WORDS, False),
+}
+
+# Transaction categories in precedence order, as (category, column, predicate):
+# 'flagged' matches rows whose column equals 1, 'present' rows whose column is not null.
+# Rows matching no rule fall back to DEFAULT_TRANSACTION_CATEGORY.
+TRANSACTION_CATEGORY_RULES = [
+    ('return', 'product_return', 'flagged'),
+    ('financial adjustment', 'financial_details', 'present'),
+    ('maintenance adjustment', 'maintenance_adjustment', 'present'),
+    ('lost sale', 'lost_sales', 'flagged'),
+]
+DEFAULT_TRANSACTION_CATEGORY = 'sale'
+
+# Raw columns scanned for test data (numeric and datetime columns can not hold it)
+TEST_DATA_COLUMNS = ['Invoice', 'StockCode', 'Description', 'Customer ID', 'Country']
+
+# Declared dtypes of the raw csv columns used by the stages (projection and typing)
+INGESTION_SCHEMA = {
+    'Invoice': 'category',
+    'StockCode': 'category',
+    'Description': 'category',
+    'Quantity': 'int32',
+    'InvoiceDate': 'datetime64[ns]',
+    'Price': 'float64',
+    'Customer ID': 'category',
+    'Country': 'category',
+}
+
+# Raw datetime columns and their source format, parsed once at ingestion
+INGESTION_DATE_FORMATS = {
+    'InvoiceDate': '%m/%d/%Y %H:%M',
+}
+
 STAGE_III_COLUMNS = [
     'invoice', 'stock_code', 'description',
     'quantity', 'invoice_date', 'price',
@@ -52,6 +96,59 @@ STAGE_III_COLUMNS = [
     'lost_sales', 'financial_details',
     'maintenance_adjustment']
 
+# Declared dtypes of the stage III frame: categoricals for low-cardinality text,
+# nullable integers for flags, nullable float for price and datetime64 for dates
+STAGE_III_DTYPES = {
+    'invoice': 'category',
+    'stock_code': 'category',
+    'description': 'category',
+    'quantity': 'int32',
+    'invoice_date': 'datetime64[ns]',
+    'price': 'Float64',
+    'customer_id': 'category',
+    'location': 'category',
+    'product_return': 'Int8',
+    'lost_sales': 'Int8',
+    'financial_details': 'Int8',
+    'maintenance_adjustment': 'Int8',
+}
+
+# Surrogate key columns of the warehouse tables, mapped to BIGINT ids in the integer key mode
+SURROGATE_KEY_COLUMNS = [
+    'time_id', 'location_id', 'product_id',
+    'metadata_id', 'customer_id', 'transaction_id'
+]
+
+# Dimension tables and their key column, members already loaded are skipped by the key registry
+DIMENSION_KEYS = {
+    'dim_time': 'time_id',
+    'dim_location': 'location_id',
+    'dim_product': 'product_id',
+    'dim_metadata_transactions': 'metadata_id',
+    'dim_customer': 'customer_id',
+}
+
+# ISO 8601 format of the datetime columns written at the output boundaries
+OUTPUT_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+# Strategies loading the warehouse tables: ORM merge (insert or update, row by row),
+# bulk insert (Core insert executemany in batches, new rows only) or set-based upsert
+# (bulk insert into a staging table, then one MERGE into the table)
+LOAD_STRATEGIES = ('merge', 'bulk', 'upsert')
+DEFAULT_LOAD_STRATEGY = 'merge'
+
+# Tables loaded in parallel partitions, by hash of a column keeping related rows
+# (and rows sharing a primary key) in the same partition
+LOAD_PARTITION_COLUMNS = {
+    'fact_sales_transactions': 'invoice_id',
+}
+
+# Tables loaded after other ones besides their foreign keys: the surrogate key map is
+# committed (and registered) before the dimension members using its ids
+LOAD_DEPENDENCIES = {
+    table_name: ('surrogate_key_map',) for table_name in DIMENSION_KEYS
+}
+
 # ORM mapping
 models_map = {
     "dim_time": DimTime,
@@ -71,3 +168,8 @@ validation_models = {
     "dim_metadata_transactions": DimMetadataTransactionValidation,
     "fact_sales_transactions": FactSalesTransactionValidation,
 }
+
+# the hash keys -> surrogate ids mapping only exists with integer surrogate keys
+if SURROGATE_KEY_MODE == 'integer':
+    models_map["surrogate_key_map"] = SurrogateKeyMap
+    validation_models["surrogate_key_map"] = SurrogateKeyMapValidation
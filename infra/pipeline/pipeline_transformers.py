@@ -1,24 +1,64 @@
 """
 Module specialized on data transformation functions.
 """
+import json
+import os
+import random
+import threading
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from hashlib import md5
 from typing import (
+    Annotated,
     Dict,
     Any,
-    Type
+    Callable,
+    List,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin
 )
 import re
 import unicodedata
 from datetime import datetime
 
+import annotated_types
 from pydantic import ValidationError
 from pydantic import BaseModel
+from pydantic import TypeAdapter
+from pydantic.fields import FieldInfo
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlalchemy
+
+from infra.pipeline.pipeline_metadata import (
+    TRANSACTION_CATEGORY_RULES,
+    DEFAULT_TRANSACTION_CATEGORY,
+    SURROGATE_KEY_COLUMNS,
+    SURROGATE_KEY_MODE,
+    DIMENSION_KEYS,
+    models_map
+)
 
 
 warnings.filterwarnings("ignore")
 
+# distinct values kept by the text normalization cache (shared across runs)
+_TEXT_CACHE_SIZE = 2 ** 16
+# distinct natural keys kept by the surrogate-key hashing cache (shared across runs)
+_KEY_CACHE_SIZE = 2 ** 18
+# rows per chunk validated by Pydantic on each worker process (pydantic engine)
+_VALIDATION_CHUNK_SIZE = 50_000
+# example rows kept per (table, field, error type) by the validation error store
+_ERROR_SAMPLE_SIZE = 5
+# invalid-row entries buffered before being spilled to the quarantine file
+_QUARANTINE_BATCH_SIZE = 100_000
+
 
 def generate_hash(value: str) -> str:
     """
@@ -29,6 +69,69 @@ def generate_hash(value: str) -> str:
         return None
     return md5(str(value).encode()).hexdigest()
 
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _hash_key(key: str) -> str:
+    """
+    Cached MD5 hex digest of a single natural key (same digest as generate_hash).
+    """
+    return md5(key.encode()).hexdigest()
+
+def _timestamp_key(value) -> str:
+    """
+    Natural key of a timestamp (its POSIX timestamp), None for missing dates.
+    """
+    return None if pd.isna(value) else str(value.timestamp())
+
+def hash_key_column(column: pd.Series, f_key: Callable = str) -> pd.Series:
+    """
+    Vectorized generate_hash(f_key(value)) over a column: the column is factorized,
+    each distinct natural key is hashed once (LRU cached) and the digests are broadcast back.
+
+    Args:
+        column: Column holding the natural keys.
+        f_key: Callable building the key string of a distinct value (default is str,
+            so missing values are keyed as 'nan'); returning None yields a null key.
+
+    Returns:
+        Object column of MD5 hex digests (or None).
+    """
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    keys = (f_key(value) for value in uniques)
+    hashes = np.array([None if key is None else _hash_key(key) for key in keys], dtype=object)
+    return pd.Series(hashes.take(codes), index=column.index, name=column.name)
+
+def hash_composite_key(columns: List[pd.Series], sep: str = '-') -> pd.Series:
+    """
+    Vectorized generate_hash(f"{a}{sep}{b}...") over aligned columns: the distinct
+    combinations are factorized, their key strings are built with vectorized string ops
+    and each one is hashed once (LRU cached) before being broadcast back.
+
+    Args:
+        columns: Aligned columns forming the composite key (missing values keyed as
+            str(value), i.e. 'nan' or 'None').
+        sep: Separator between the key parts.
+
+    Returns:
+        Object column of MD5 hex digests.
+    """
+    key_codes, keys = None, None
+    for column in columns:
+        codes, uniques = pd.factorize(column, use_na_sentinel=False)
+        parts = pd.Series([str(value) for value in uniques], dtype=object)
+        if key_codes is None:
+            key_codes, keys = codes, parts
+            continue
+        # combinations of the previous key and this column, re-factorized to stay compact
+        key_codes, combined = pd.factorize(key_codes.astype(np.int64) * len(uniques) + codes)
+        keys = (
+            keys.take(combined // len(uniques)).reset_index(drop=True)
+            + sep
+            + parts.take(combined % len(uniques)).reset_index(drop=True)
+        )
+
+    hashes = np.array([_hash_key(key) for key in keys], dtype=object)
+    return pd.Series(hashes.take(key_codes), index=columns[0].index)
+
 def sanitize_column_data(bg_logger, df, column, c_dtype=str):
     """
     Corrects and specializes the data column format, replacing invalid values with NaN.
@@ -41,7 +144,11 @@ def sanitize_column_data(bg_logger, df, column, c_dtype=str):
         The transformed column.
     """
     start_time = datetime.now()
-    df[column] = df[column].str.strip()
+    if isinstance(df[column].dtype, pd.CategoricalDtype):
+        # stripped once per category, keeping the column categorical
+        df[column] = normalize_text_column(df[column], str.strip)
+    else:
+        df[column] = df[column].str.strip()
 
     bg_logger.info(
         "Specializing column data '%s' to '%s'. It took %s",
@@ -83,79 +190,849 @@ def sanitize_text(text):
 
     return text
 
-class BaseTableGenerator:
+@lru_cache(maxsize=_TEXT_CACHE_SIZE)
+def _normalize_value(f_sanitize_text: Callable, text: str) -> str:
     """
-    Base class for table generation with shared preprocessing methods.
+    Cached normalization of a single distinct value.
     """
-    def __init__(self, dataframe: pd.DataFrame):
-        self.df = dataframe
+    return f_sanitize_text(text)
+
+def normalize_text_column(
+    column: pd.Series,
+    f_sanitize_text: Callable = sanitize_text,
+    mapping: Dict[str, str] = None
+) -> pd.Series:
+    """
+    Normalizes a text column once per distinct value instead of once per row:
+    the column is factorized, each distinct value goes through the (LRU cached)
+    normalization and the optional value mapping, and results are broadcast back.
+
+    Args:
+        column: Text column (object, string or categorical).
+        f_sanitize_text: Callable normalizing a single value (default is sanitize_text).
+        mapping: Optional mapping applied to the normalized values (e.g. NORMATIZE_LOCATION_MAP).
+
+    Returns:
+        The normalized column, categorical if the input was categorical.
+    """
+    mapping = mapping or {}
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes, uniques = column.cat.codes.to_numpy(), column.cat.categories
+    else:
+        codes, uniques = pd.factorize(column)
+
+    normalized = [
+        mapping.get(value, value)
+        for value in (_normalize_value(f_sanitize_text, text) for text in uniques)
+    ]
+
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # distinct values may collapse after normalization (e.g. "USA" and "US")
+        normalized_codes, normalized_uniques = pd.factorize(pd.Index(normalized, dtype=object))
+        return pd.Series(
+            pd.Categorical.from_codes(
+                np.where(codes >= 0, normalized_codes.take(codes), -1),
+                normalized_uniques
+            ),
+            index=column.index,
+            name=column.name
+        )
+
+    return pd.Series(
+        np.array(normalized + [np.nan], dtype=object).take(codes),
+        index=column.index,
+        name=column.name
+    )
+
+class DescriptionClassifier:
+    """
+    Multi-label keyword classifier for descriptions.
+
+    All the keyword rules are compiled into a single regex of optional named
+    lookaheads, so one match per text yields every label at once. Texts are
+    classified once per distinct value (LRU cached) and broadcast back to the rows.
+    """
+    def __init__(self, rules: Dict[str, Tuple[List[str], bool]]):
+        """
+        Args:
+            rules: Mapping of label to (keywords, anchored). Anchored keywords only match
+                whole words at the start of the text, the others match anywhere (case-insensitive).
+        """
+        self.labels = list(rules)
+        _lookaheads = []
+        for label, (keywords, anchored) in rules.items():
+            _keywords = '|'.join(re.escape(word) for word in keywords if word)
+            if anchored:
+                _lookaheads.append(rf'(?=(?P<{label}>(?:{_keywords})\b))?')
+            else:
+                _lookaheads.append(rf'(?=.*?(?P<{label}>{_keywords}))?')
+        self.pattern = re.compile(''.join(_lookaheads), re.IGNORECASE | re.DOTALL)
+        self.classify_value = lru_cache(maxsize=_TEXT_CACHE_SIZE)(self._classify_value)
 
-    def standardize_category(self, row: Dict[str, any]) -> str:
+    def _classify_value(self, text: str) -> Tuple[bool, ...]:
         """
-        Maps specific columns to standardized categories.
+        Returns the label flags of a single text.
         """
-        if row.get("product_return") == 1:
-            return "return"
-        if not pd.isna(row.get("financial_details")):
-            return "financial adjustment"
-        if not pd.isna(row.get("maintenance_adjustment")):
-            return "maintenance adjustment"
-        if row.get("lost_sales") == 1:
-            return "lost sale"
-        return "sale"
+        _match = self.pattern.match(text)
+        return tuple(_match.group(label) is not None for label in self.labels)
 
-    def preprocess(self):
+    def classify(self, column: pd.Series) -> pd.DataFrame:
         """
-        Standardize and prepare data for all tables.
+        Classifies a text column.
+
+        Args:
+            column: Text column (object, string or categorical). Nulls match no label.
+
+        Returns:
+            DataFrame with one integer (1/0) flag column per label, aligned to the column.
         """
-        self.df['transaction_category'] = self.df.apply(self.standardize_category, axis=1)
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes, uniques = column.cat.codes.to_numpy(), column.cat.categories
+        else:
+            codes, uniques = pd.factorize(column)
 
-        # Parse invoice_date and extract time components
-        self.df['invoice_date'] = pd.to_datetime(self.df['invoice_date'], errors='coerce')
-        self.df['year'] = self.df['invoice_date'].dt.year
-        self.df['quarter'] = self.df['invoice_date'].dt.quarter
-        self.df['month'] = self.df['invoice_date'].dt.month
-        self.df['day'] = self.df['invoice_date'].dt.day
-        self.df['week'] = self.df['invoice_date'].dt.isocalendar().week
-        self.df['day_of_week'] = self.df['invoice_date'].dt.day_name()
-        self.df['price'] = self.df['price'].fillna(0.0)
+        _flags = np.array(
+            [self.classify_value(str(text)) for text in uniques]
+            + [(False,) * len(self.labels)],
+            dtype=bool
+        ).reshape(-1, len(self.labels))
 
-        self.df['time_id'] = self.df['invoice_date'].apply(
-            lambda x: generate_hash(str(pd.Timestamp(x).timestamp()))
+        return pd.DataFrame(
+            _flags.take(codes, axis=0).astype(int),
+            index=column.index,
+            columns=self.labels
         )
-        # Generate IDs directly in the main DataFrame
-        # preserving null references
-        self.df['location_id'] = self.df['location'].apply(
-            lambda x: generate_hash(str(x))
+
+def get_memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the memory usage of each column of a DataFrame.
+
+    Args:
+        df: DataFrame to report.
+
+    Returns:
+        DataFrame indexed by column, with its dtype and deep memory usage in MB.
+    """
+    _usage = df.memory_usage(deep=True, index=False)
+    return pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'memory_mb': (_usage / 1024 ** 2).round(2),
+    })
+
+class InvoiceKeyIndex:
+    """
+    Integer codes of Invoice, StockCode and of the (Invoice, StockCode) pair,
+    built once per frame and shared by every flagging rule, so membership tests
+    are array lookups instead of re-hashing the string columns on every rule.
+    """
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df: DataFrame with Invoice and StockCode columns.
+        """
+        self.index = df.index
+        # nulls get their own code, as isin matches nulls against nulls
+        self.invoice_codes, self.invoices = pd.factorize(df['Invoice'], use_na_sentinel=False)
+        self.stock_codes, self.stocks = pd.factorize(df['StockCode'], use_na_sentinel=False)
+        self.pair_codes, _pairs = pd.factorize(
+            self.invoice_codes.astype(np.int64) * len(self.stocks) + self.stock_codes
         )
-        self.df['product_id'] = self.df['stock_code'].apply(
-            lambda x: generate_hash(str(x))
+        self.n_pairs = len(_pairs)
+
+    def is_for(self, df: pd.DataFrame) -> bool:
+        """
+        Whether the index was built for the rows of the DataFrame.
+        """
+        return df.index is self.index or (
+            len(df) == len(self.index) and df.index.equals(self.index)
         )
-        self.df['metadata_id'] = self.df['transaction_category'].apply(
-            lambda x: generate_hash(str(x))
+
+    @staticmethod
+    def _lookup(codes: np.ndarray, n_codes: int, mask: np.ndarray) -> np.ndarray:
+        """
+        Rows whose code is among the codes of the masked rows.
+        """
+        _hits = np.zeros(n_codes, dtype=bool)
+        _hits[codes[mask]] = True
+        return _hits[codes]
+
+    def invoice_matches(self, mask) -> np.ndarray:
+        """
+        Rows whose Invoice is among the Invoices of the masked rows.
+        """
+        return self._lookup(self.invoice_codes, len(self.invoices), np.asarray(mask, dtype=bool))
+
+    def matches(self, mask, exact_pair: bool = False) -> np.ndarray:
+        """
+        Rows matching the masked rows, either on Invoice and StockCode independently
+        (any masked Invoice and any masked StockCode) or on the exact (Invoice, StockCode) pair.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if exact_pair:
+            return self._lookup(self.pair_codes, self.n_pairs, mask)
+        return (
+            self._lookup(self.invoice_codes, len(self.invoices), mask)
+            & self._lookup(self.stock_codes, len(self.stocks), mask)
         )
-        self.df['customer_code'] = self.df['customer_id']
-        self.df['customer_id'] = self.df['customer_code'].apply(
-            lambda x: generate_hash(str(x))
+
+def flag_product_returns(df: pd.DataFrame, key_index: InvoiceKeyIndex = None) -> pd.Series:
+    """
+    Flags every line of the invoices holding a possible product return: a line with
+    zero or negative price whose quantity is lower than the quantity of a positive
+    price line of the same Invoice and StockCode.
+
+    Instead of merging returns against sales, both sides are reduced to a grouped
+    aggregate per (Invoice, StockCode) - the lowest returned quantity and the highest
+    sold quantity - which holds a matching pair only if min(return) < max(sale).
+
+    Args:
+        df: DataFrame with Invoice, StockCode, Quantity and Price columns.
+        key_index: Optional key index of the DataFrame, used for the invoice membership.
+
+    Returns:
+        Integer (1/0) product return flags, aligned to the DataFrame.
+    """
+    keys = ['Invoice', 'StockCode']
+    _returns = df.loc[df['Price'] <= 0, keys + ['Quantity']].groupby(
+        keys, observed=True, dropna=False
+    )['Quantity'].min()
+    _sales = df.loc[df['Price'] > 0, keys + ['Quantity']].groupby(
+        keys, observed=True, dropna=False
+    )['Quantity'].max()
+
+    _pairs = _returns.to_frame('Quantity_return').join(
+        _sales.rename('Quantity_sale'), how='inner'
+    )
+    _return_invoices = _pairs.index.get_level_values('Invoice')[
+        _pairs['Quantity_return'] < _pairs['Quantity_sale']
+    ].unique()
+
+    # hash-set membership of every line against the invoices holding returns
+    if key_index is None:
+        return df['Invoice'].isin(_return_invoices).astype(int)
+
+    _hits = np.zeros(len(key_index.invoices), dtype=bool)
+    _codes = key_index.invoices.get_indexer(_return_invoices)
+    _hits[_codes[_codes >= 0]] = True
+    return pd.Series(_hits[key_index.invoice_codes].astype(int), index=df.index)
+
+class TransactionCategorizer:
+    """
+    Vectorized transaction categorization.
+
+    Evaluates a declarative, precedence-ordered rule table with columnar boolean
+    masks: each row gets the category of the first rule it matches, or the default.
+    """
+    predicates = {
+        'flagged': lambda column: column.eq(1).fillna(False).to_numpy(dtype=bool),
+        'present': lambda column: column.notna().to_numpy(dtype=bool),
+    }
+
+    def __init__(
+        self,
+        rules: List[Tuple[str, str, str]] = None,
+        default: str = DEFAULT_TRANSACTION_CATEGORY
+    ):
+        """
+        Args:
+            rules: Precedence-ordered (category, column, predicate) rules
+                (defaults to TRANSACTION_CATEGORY_RULES).
+            default: Category of the rows matching no rule.
+        """
+        self.rules = TRANSACTION_CATEGORY_RULES if rules is None else rules
+        self.default = default
+        for category, _, predicate in self.rules:
+            if predicate not in self.predicates:
+                raise ValueError(f"Unknown predicate '{predicate}' for category '{category}'")
+
+    def categorize(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Returns the category of every row (rules over missing columns never match).
+        """
+        _categories, _masks = [], []
+        for category, column, predicate in self.rules:
+            if column not in df.columns:
+                continue
+            _categories.append(category)
+            _masks.append(self.predicates[predicate](df[column]))
+
+        _values = np.select(_masks, _categories, default=self.default) if _masks else (
+            np.full(len(df), self.default)
         )
+        return pd.Series(_values.astype(object), index=df.index)
 
-        self.df['transaction_id'] = self.df.apply(
-            lambda row: generate_hash(f"{row['invoice']}-{row['time_id']}"), axis=1
+class CalendarDimension:
+    """
+    Precomputed daily calendar holding the date attributes of dim_time.
+
+    The calendar covers whole years, is persisted as Parquet (when a path is given)
+    and reused across runs, only being extended when dates outside its range show up.
+    """
+    columns = ['year', 'quarter', 'month', 'day', 'week', 'day_of_week']
+
+    def __init__(self, cache_path: str = None):
+        """
+        Args:
+            cache_path: Parquet file persisting the calendar (None keeps it in memory).
+        """
+        self.cache_path = cache_path
+        self.table = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """
+        Builds the calendar of the days between start and end (inclusive), indexed by date.
+        """
+        dates = pd.date_range(start.normalize(), end.normalize(), freq='D', name='date')
+        return pd.DataFrame({
+            'year': dates.year.astype('int32'),
+            'quarter': dates.quarter.astype('int32'),
+            'month': dates.month.astype('int32'),
+            'day': dates.day.astype('int32'),
+            'week': dates.isocalendar()['week'].array,
+            'day_of_week': dates.day_name().astype(object),
+        }, index=dates)
+
+    def _load(self):
+        """
+        Loads the persisted calendar, if any.
+        """
+        if self.table is None and self.cache_path and os.path.exists(self.cache_path):
+            self.table = pd.read_parquet(self.cache_path)
+
+    def _save(self):
+        """
+        Persists the calendar atomically.
+        """
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        _tmp_path = f"{self.cache_path}.tmp"
+        self.table.to_parquet(_tmp_path)
+        os.replace(_tmp_path, self.cache_path)
+
+    def cover(self, dates: pd.Series) -> pd.DataFrame:
+        """
+        Extends the calendar (by whole years) to cover the given dates and returns it.
+        """
+        with self._lock:
+            self._load()
+            _start, _end = dates.min(), dates.max()
+            if pd.isna(_start):
+                return self.table
+
+            _start = pd.Timestamp(year=_start.year, month=1, day=1)
+            _end = pd.Timestamp(year=_end.year, month=12, day=31)
+            _parts = []
+            if self.table is None or self.table.empty:
+                _parts.append(self.build(_start, _end))
+            else:
+                if _start < self.table.index[0]:
+                    _parts.append(self.build(_start, self.table.index[0] - pd.Timedelta(days=1)))
+                if _end > self.table.index[-1]:
+                    _parts.append(self.build(self.table.index[-1] + pd.Timedelta(days=1), _end))
+                if _parts:
+                    _parts.append(self.table)
+
+            if _parts:
+                self.table = pd.concat(_parts).sort_index()
+                self._save()
+            return self.table
+
+    def lookup(self, timestamps: pd.Series) -> pd.DataFrame:
+        """
+        Returns the calendar attributes of each timestamp (missing for NaT), aligned to it.
+        """
+        _dates = timestamps.dt.normalize()
+        _table = self.cover(_dates)
+        if _table is None:
+            return pd.DataFrame(index=timestamps.index, columns=self.columns)
+        _attributes = _table.reindex(_dates.to_numpy())
+        _attributes.index = timestamps.index
+        return _attributes
+
+def _count_warehouse_rows(
+    engine: sqlalchemy.engine.Engine, table_names: List[str]
+) -> Dict[str, int]:
+    """
+    Returns the row count of each warehouse table.
+    """
+    with engine.connect() as connection:
+        return {
+            table_name: connection.execute(
+                sqlalchemy.select(sqlalchemy.func.count()).select_from(
+                    models_map[table_name].__table__
+                )
+            ).scalar()
+            for table_name in table_names
+        }
+
+class DimensionKeyRegistry:
+    """
+    Persistent registry of the keys already loaded into the warehouse.
+
+    Holds (key_name, hash_key, surrogate_id, is_member) entries: surrogate_id is only set
+    in the integer key mode, where the registry also holds the surrogate key map, and
+    is_member flags the keys loaded as dimension members. It is persisted locally as
+    Parquet and checked against the warehouse row counts on every run (synced again
+    when missing or stale). Runs use it to emit only new dimension members, without
+    reading the dimensions back, and to keep integer surrogate ids stable across runs.
+    """
+    columns = ['key_name', 'hash_key', 'surrogate_id', 'is_member']
+
+    def __init__(self, cache_path: str = None, key_mode: str = SURROGATE_KEY_MODE):
+        """
+        Args:
+            cache_path: Parquet file persisting the registry (None keeps it in memory).
+            key_mode: Surrogate key mode of the warehouse the registry belongs to.
+        """
+        self.cache_path = cache_path
+        self.key_mode = key_mode
+        self.entries = self._empty_entries()
+        # True once the registry holds the warehouse state (loaded from its cache or synced)
+        self.is_loaded = False
+        if cache_path and os.path.exists(cache_path):
+            _entries = pd.read_parquet(cache_path)
+            # caches written before the membership flag are synced again
+            if list(_entries.columns) == self.columns:
+                self.entries = _entries
+                self.is_loaded = True
+
+    @classmethod
+    def _empty_entries(cls) -> pd.DataFrame:
+        return pd.DataFrame({
+            'key_name': pd.Series(dtype=object),
+            'hash_key': pd.Series(dtype=object),
+            'surrogate_id': pd.Series(dtype='Int64'),
+            'is_member': pd.Series(dtype=bool),
+        })
+
+    def mapping(self, key_name: str) -> pd.Series:
+        """
+        Returns the registered surrogate ids of a key column, indexed by hash key.
+        """
+        _entries = self.entries[self.entries['key_name'] == key_name]
+        return pd.Series(
+            _entries['surrogate_id'].array,
+            index=pd.Index(_entries['hash_key'], dtype=object),
+            name='surrogate_id'
         )
 
+    def contains(self, key_name: str, keys: pd.Series) -> np.ndarray:
+        """
+        Returns which keys (hash keys, or surrogate ids in the integer key mode) are
+        registered as dimension members.
+        """
+        _entries = self.entries[
+            (self.entries['key_name'] == key_name) & self.entries['is_member']
+        ]
+        _registered = _entries['surrogate_id' if self.key_mode == 'integer' else 'hash_key']
+        return keys.isin(_registered).to_numpy(dtype=bool)
+
+    def register(self, key_name: str, hash_keys, surrogate_ids=None, is_member: bool = True):
+        """
+        Registers keys of a key column (already registered hash keys are ignored).
+        """
+        _new = pd.DataFrame({
+            'key_name': key_name,
+            'hash_key': pd.Series(hash_keys, dtype=object).to_numpy(),
+            'surrogate_id': pd.array(
+                [pd.NA] * len(hash_keys) if surrogate_ids is None else surrogate_ids,
+                dtype='Int64'
+            ),
+            'is_member': is_member,
+        }).dropna(subset=['hash_key']).drop_duplicates(subset=['hash_key'])
+        _registered = self.entries.loc[self.entries['key_name'] == key_name, 'hash_key']
+        self.entries = pd.concat(
+            [self.entries, _new[~_new['hash_key'].isin(_registered)]], ignore_index=True
+        )
+
+    def register_members(self, key_name: str, surrogate_ids):
+        """
+        Flags the mapped surrogate ids of a key column as dimension members (integer key mode).
+        """
+        _members = (self.entries['key_name'] == key_name) & (
+            self.entries['surrogate_id'].isin(pd.array(surrogate_ids, dtype='Int64'))
+        ).fillna(False).to_numpy(dtype=bool)
+        self.entries.loc[_members, 'is_member'] = True
+
+    def sync(self, engine: sqlalchemy.engine.Engine):
+        """
+        Rebuilds the registry from the keys already in the warehouse: the key column of
+        every dimension, and the surrogate key map in the integer key mode.
+        The registry is persisted by save(), once the next load succeeded.
+        """
+        self.entries = self._empty_entries()
+        with engine.connect() as connection:
+            if self.key_mode == 'integer':
+                _table = models_map['surrogate_key_map'].__table__
+                _keys = pd.read_sql(sqlalchemy.select(_table), connection)
+                for key_name, entries in _keys.groupby('key_name'):
+                    self.register(
+                        key_name, entries['hash_key'], entries['surrogate_id'], is_member=False
+                    )
+            for table_name, key_name in DIMENSION_KEYS.items():
+                _column = models_map[table_name].__table__.c[key_name]
+                _keys = pd.read_sql(sqlalchemy.select(_column), connection)
+                if self.key_mode == 'integer':
+                    self.register_members(key_name, _keys[key_name])
+                else:
+                    self.register(key_name, _keys[key_name])
+        self.is_loaded = True
+
+    def matches(self, engine: sqlalchemy.engine.Engine) -> bool:
+        """
+        Checks the registry against the warehouse row counts: every dimension holds
+        as many rows as its registered members (and the surrogate key map as many
+        rows as the registered keys, in the integer key mode).
+        """
+        _expected = {
+            table_name: int((
+                (self.entries['key_name'] == key_name) & self.entries['is_member']
+            ).sum())
+            for table_name, key_name in DIMENSION_KEYS.items()
+        }
+        if self.key_mode == 'integer':
+            _expected['surrogate_key_map'] = len(self.entries)
+        return _count_warehouse_rows(engine, list(_expected)) == _expected
+
+    def refresh(self, engine: sqlalchemy.engine.Engine) -> bool:
+        """
+        Syncs the registry from the warehouse when it has no local copy, or when its
+        copy no longer matches the warehouse (e.g. restored or truncated tables).
+
+        Returns:
+            True if the registry was synced.
+        """
+        if self.is_loaded and self.matches(engine):
+            return False
+        self.sync(engine)
+        return True
+
+    def filter_new_members(self, tables: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+        """
+        Drops the registered members of the dimension tables (in place).
+
+        Returns:
+            Number of skipped members per dimension table.
+        """
+        _skipped = {}
+        for table_name, key_name in DIMENSION_KEYS.items():
+            if table_name not in tables:
+                continue
+            _registered = self.contains(key_name, tables[table_name][key_name])
+            _skipped[table_name] = int(_registered.sum())
+            tables[table_name] = tables[table_name][~_registered]
+        return _skipped
+
+    def register_tables(self, tables: Dict[str, pd.DataFrame]):
+        """
+        Registers the keys of loaded tables: the dimension members, and the new
+        surrogate key map entries in the integer key mode.
+        """
+        if self.key_mode == 'integer':
+            _key_map = tables.get('surrogate_key_map')
+            if _key_map is not None:
+                for key_name, entries in _key_map.groupby('key_name'):
+                    self.register(
+                        key_name, entries['hash_key'], entries['surrogate_id'], is_member=False
+                    )
+
+        for table_name, key_name in DIMENSION_KEYS.items():
+            if table_name not in tables:
+                continue
+            if self.key_mode == 'integer':
+                self.register_members(key_name, tables[table_name][key_name])
+            else:
+                self.register(key_name, tables[table_name][key_name])
+
+    def save(self):
+        """
+        Persists the registry atomically.
+        """
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        _tmp_path = f"{self.cache_path}.tmp"
+        self.entries.to_parquet(_tmp_path, index=False)
+        os.replace(_tmp_path, self.cache_path)
+
+class RowFingerprintIndex:
+    """
+    Persistent index of the content fingerprints of the rows loaded into the warehouse.
+
+    Each row is identified by a hash of its primary key and fingerprinted by a hash of its
+    other columns (64-bit, see pd.util.hash_pandas_object), so reloads of overlapping
+    extracts only send new or changed rows. The index is a local sidecar, persisted as
+    Parquet (one per warehouse), like the key registry; without it every row is sent.
+    The warehouse row count of each indexed table is kept as a watermark, so the entries
+    of a table changed outside of the pipeline (rows deleted, restored) are dropped.
+    """
+    columns = ['table_name', 'row_key', 'fingerprint']
+
+    def __init__(self, cache_path: str = None):
+        """
+        Args:
+            cache_path: Parquet file persisting the index (None keeps it in memory).
+        """
+        self.cache_path = cache_path
+        # warehouse row count of each indexed table, when its entries were last stored
+        self.row_counts: Dict[str, int] = {}
+        if cache_path and os.path.exists(cache_path):
+            _table = pq.read_table(cache_path)
+            self.entries = _table.to_pandas()
+            self.row_counts = json.loads(
+                (_table.schema.metadata or {}).get(b'row_counts', b'{}')
+            )
+        else:
+            self.entries = pd.DataFrame({
+                'table_name': pd.Series(dtype=object),
+                'row_key': pd.Series(dtype='uint64'),
+                'fingerprint': pd.Series(dtype='uint64'),
+            })
+
+    def discard(self, table_name: str):
+        """
+        Drops the stored fingerprints of a table, so all of its rows are sent again.
+        """
+        self.entries = self.entries[self.entries['table_name'] != table_name]
+        self.row_counts.pop(table_name, None)
+
+    def validate(self, engine: sqlalchemy.engine.Engine) -> List[str]:
+        """
+        Drops the fingerprints of the tables whose warehouse row count no longer
+        matches their watermark (or without one).
+
+        Returns:
+            Names of the tables whose fingerprints were dropped.
+        """
+        _indexed = [
+            table_name for table_name in self.entries['table_name'].unique()
+            if table_name in models_map
+        ]
+        _counts = _count_warehouse_rows(engine, _indexed)
+        _discarded = [
+            table_name for table_name in _indexed
+            if self.row_counts.get(table_name) != _counts[table_name]
+        ]
+        for table_name in _discarded:
+            self.discard(table_name)
+        return _discarded
+
+    def update_row_counts(self, engine: sqlalchemy.engine.Engine):
+        """
+        Stores the current warehouse row count of every indexed table as its watermark.
+        """
+        self.row_counts = _count_warehouse_rows(engine, [
+            table_name for table_name in self.entries['table_name'].unique()
+            if table_name in models_map
+        ])
+
+    @staticmethod
+    def fingerprint(table_name: str, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the primary key hash and the content fingerprint (hash of the non-key
+        columns) of every row of a warehouse table.
+        """
+        _keys = [column.name for column in models_map[table_name].__table__.primary_key]
+        _values = [column for column in df.columns if column not in _keys]
+        _row_keys = pd.util.hash_pandas_object(df[_keys], index=False).to_numpy()
+        if not _values:
+            return _row_keys, np.zeros(len(df), dtype='uint64')
+        return _row_keys, pd.util.hash_pandas_object(df[_values], index=False).to_numpy()
+
+    def _stored(self, table_name: str) -> pd.Series:
+        """
+        Returns the stored fingerprints of a table, indexed by row key.
+        """
+        _entries = self.entries[self.entries['table_name'] == table_name]
+        return pd.Series(
+            _entries['fingerprint'].to_numpy(), index=pd.Index(_entries['row_key'].to_numpy())
+        )
+
+    def filter_changed_rows(self, tables: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+        """
+        Drops the rows whose fingerprint is already stored for their key (in place).
+        Rows sharing a primary key are loaded as their last one, so they are kept
+        or dropped together, by the fingerprint of the last one.
+
+        Returns:
+            Number of unchanged rows skipped per table.
+        """
+        _skipped = {}
+        for table_name, df in tables.items():
+            if table_name not in models_map or df.empty:
+                continue
+            _row_keys, _fingerprints = self.fingerprint(table_name, df)
+            _stored = self._stored(table_name)
+            _positions = _stored.index.get_indexer(_row_keys)
+            _matched = _positions >= 0
+            _unchanged = np.zeros(len(df), dtype=bool)
+            _unchanged[_matched] = (
+                _stored.to_numpy()[_positions[_matched]] == _fingerprints[_matched]
+            )
+            _last = ~pd.Series(_row_keys).duplicated(keep='last').to_numpy()
+            _by_key = pd.Series(_unchanged[_last], index=_row_keys[_last])
+            _unchanged = _by_key.reindex(_row_keys).to_numpy(dtype=bool)
+            _skipped[table_name] = int(_unchanged.sum())
+            tables[table_name] = df[~_unchanged]
+        return _skipped
+
+    def register_tables(self, tables: Dict[str, pd.DataFrame]):
+        """
+        Stores the fingerprints of the loaded rows (the last one of each key),
+        replacing the previous fingerprints of their keys.
+        """
+        for table_name, df in tables.items():
+            if table_name not in models_map or df.empty:
+                continue
+            _row_keys, _fingerprints = self.fingerprint(table_name, df)
+            _new = pd.DataFrame({
+                'table_name': table_name, 'row_key': _row_keys, 'fingerprint': _fingerprints
+            }).drop_duplicates(subset=['row_key'], keep='last')
+            _replaced = (self.entries['table_name'] == table_name) & (
+                self.entries['row_key'].isin(_new['row_key'])
+            )
+            self.entries = pd.concat([self.entries[~_replaced], _new], ignore_index=True)
+
+    def save(self):
+        """
+        Persists the index atomically, with the row count watermarks.
+        """
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        _tmp_path = f"{self.cache_path}.tmp"
+        _table = pa.Table.from_pandas(self.entries, preserve_index=False)
+        _table = _table.replace_schema_metadata({
+            **(_table.schema.metadata or {}),
+            b'row_counts': json.dumps(self.row_counts).encode(),
+        })
+        pq.write_table(_table, _tmp_path)
+        os.replace(_tmp_path, self.cache_path)
+
+class SurrogateKeyMapper:
+    """
+    Assigns compact BIGINT surrogate keys to the MD5 hash keys (integer key mode).
+
+    Ids are assigned deterministically from the natural keys: keys already in the
+    registry keep their id, new keys get the next ids per key column, in the order
+    of their hash keys. The new entries are kept as a mapping table so warehouse rows
+    can be traced back to their hash keys.
+    """
+    def __init__(self, registry: DimensionKeyRegistry):
+        """
+        Args:
+            registry: Registry of the ids assigned (and loaded) on previous runs,
+                synced from the warehouse or read back from its local copy.
+        """
+        if registry is None or not registry.is_loaded:
+            raise ValueError(
+                "Integer surrogate keys need a key registry synced from the warehouse"
+            )
+        self.registry = registry
+        # key column -> Series of new surrogate ids indexed by hash key
+        self.mappings: Dict[str, pd.Series] = {}
+
+    def assign(self, key_name: str, hash_keys: pd.Series) -> pd.Series:
+        """
+        Maps a column of hash keys to their surrogate ids (null hash keys stay null).
+        """
+        codes, uniques = pd.factorize(hash_keys)
+        _known = self.registry.mapping(key_name)
+        ids = _known.reindex(uniques).to_numpy(dtype=np.float64)
+        _is_new = np.isnan(ids)
+        _new_uniques = uniques[_is_new]
+        _new_ids = np.empty(len(_new_uniques), dtype=np.int64)
+        _new_ids[_new_uniques.argsort()] = np.arange(1, len(_new_uniques) + 1) + (
+            int(_known.max()) if len(_known) else 0
+        )
+        ids[_is_new] = _new_ids
+        ids = ids.astype(np.int64)
+        self.mappings[key_name] = pd.Series(_new_ids, index=_new_uniques, name='surrogate_id')
+
+        return pd.Series(
+            pd.arrays.IntegerArray(np.append(ids, 0).take(codes), codes < 0),
+            index=hash_keys.index,
+            name=hash_keys.name
+        )
+
+    def mapping_table(self) -> pd.DataFrame:
+        """
+        Returns the new (key_name, hash_key, surrogate_id) mapping entries of every key column.
+        """
+        return pd.concat([
+            pd.DataFrame({
+                'key_name': key_name,
+                'hash_key': mapping.index.astype(object),
+                'surrogate_id': mapping.to_numpy(),
+            })
+            for key_name, mapping in self.mappings.items()
+        ], ignore_index=True)
+
+class BaseTableGenerator:
+    """
+    Base class for table generation with shared preprocessing methods.
+    """
+    def __init__(
+        self,
+        dataframe: pd.DataFrame,
+        categorizer: TransactionCategorizer = None,
+        key_mapper: SurrogateKeyMapper = None
+    ):
+        self.df = dataframe
+        self.categorizer = categorizer or TransactionCategorizer()
+        self.key_mapper = key_mapper
+
+    def preprocess(self):
+        """
+        Standardize and prepare data for all tables.
+        """
+        self.df['transaction_category'] = self.categorizer.categorize(self.df)
+
+        # Parse invoice_date (unless already datetime64),
+        # its time components are joined from the calendar dimension by DimTimeGenerator
+        if not pd.api.types.is_datetime64_any_dtype(self.df['invoice_date']):
+            self.df['invoice_date'] = pd.to_datetime(self.df['invoice_date'], errors='coerce')
+        self.df['price'] = self.df['price'].fillna(0.0)
+
+        # Generate IDs directly in the main DataFrame, hashing each distinct
+        # natural key once (missing values keep their 'nan' key)
+        self.df['time_id'] = hash_key_column(self.df['invoice_date'], _timestamp_key)
+        self.df['location_id'] = hash_key_column(self.df['location'])
+        self.df['product_id'] = hash_key_column(self.df['stock_code'])
+        self.df['metadata_id'] = hash_key_column(self.df['transaction_category'])
+        self.df['customer_code'] = self.df['customer_id']
+        self.df['customer_id'] = hash_key_column(self.df['customer_code'])
+
+        self.df['transaction_id'] = hash_composite_key(
+            [self.df['invoice'], self.df['time_id']]
+        )
+
+        # integer key mode: hash keys are replaced by their BIGINT surrogate ids
+        if self.key_mapper is not None:
+            for column in SURROGATE_KEY_COLUMNS:
+                self.df[column] = self.key_mapper.assign(column, self.df[column])
+
 class DimTimeGenerator(BaseTableGenerator):
     """
     Generates the dim_time table.
     """
+    def __init__(self, dataframe: pd.DataFrame, calendar: CalendarDimension = None):
+        super().__init__(dataframe)
+        self.calendar = calendar or CalendarDimension()
+
     def generate_table(self) -> pd.DataFrame:
         """
-        Creates the dim_time table from the preprocessed data.
+        Creates the dim_time table from the preprocessed data,
+        joining each distinct time to the calendar dimension.
         """
-        dim_time = self.df[[
-            'time_id', 'year', 'quarter',
-            'month', 'day', 'week', 'day_of_week'
-        ]].drop_duplicates(subset=['time_id'])
+        dim_time = self.df[['time_id', 'invoice_date']].drop_duplicates(subset=['time_id'])
         dim_time.dropna(subset=['time_id'], inplace=True)
+        dim_time = dim_time[['time_id']].join(
+            self.calendar.lookup(dim_time['invoice_date'])[CalendarDimension.columns]
+        )
         return dim_time
 
 class DimLocationGenerator(BaseTableGenerator):
@@ -233,65 +1110,506 @@ class FactSalesTransactionGenerator(BaseTableGenerator):
         fact_sales_transactions.rename(columns={'invoice': 'invoice_id'}, inplace=True)
         return fact_sales_transactions
 
-def generate_warehouse_sales_tables(bg_logger, data: pd.DataFrame):
+# warehouse tables and their generators, in the order they are returned (and loaded)
+_TABLE_GENERATORS = {
+    'dim_time': DimTimeGenerator,
+    'dim_location': DimLocationGenerator,
+    'dim_product': DimProductGenerator,
+    'dim_metadata_transactions': DimMetadataTransactionGenerator,
+    'dim_customer': DimCustomerGenerator,
+    'fact_sales_transactions': FactSalesTransactionGenerator,
+}
+
+def _generate_table(bg_logger, table_name: str, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """
+    Runs the generator of a single table over the preprocessed data, logging its timing.
+    """
+    start_time = datetime.now()
+    table = _TABLE_GENERATORS[table_name](df, **kwargs).generate_table()
+    bg_logger.info(
+        "%s table generated successfully in %s", table_name, str(datetime.now() - start_time)
+    )
+    return table
+
+def generate_warehouse_sales_tables(
+    bg_logger,
+    data: pd.DataFrame,
+    max_workers: int = None,
+    calendar: CalendarDimension = None,
+    key_mode: str = SURROGATE_KEY_MODE,
+    key_registry: DimensionKeyRegistry = None
+):
     """
     Generates all tables required for the warehouse_sales database.
+    Each table is an independent projection of the preprocessed data, so the
+    generators run concurrently on a thread pool (pandas releases the GIL while
+    hashing and deduplicating).
 
     Args:
         bg_logger: Logger instance for logging.
         data (pd.DataFrame): The input data to generate tables from.
+        max_workers (int): Threads generating tables (default one per table, 1 runs them sequentially).
+        calendar (CalendarDimension): Calendar joined to dim_time (default is an in-memory one).
+        key_mode (str): 'hash' keeps the MD5 hex keys, 'integer' maps them to BIGINT
+            surrogate ids and adds their 'surrogate_key_map' table (default is WAREHOUSE_KEY_MODE).
+        key_registry (DimensionKeyRegistry): Registry keeping the integer surrogate ids
+            of previous runs (new ids continue after them), required in integer key mode.
     
     Returns:
         Dict[str, pd.DataFrame]: A dictionary mapping table names to their corresponding DataFrames.
     """
-    base_gen = BaseTableGenerator(data)
+    start_time = datetime.now()
+    if key_mode == 'integer' and (key_registry is None or not key_registry.is_loaded):
+        bg_logger.critical("Integer surrogate keys without a key registry synced from the warehouse")
+        raise ValueError(
+            "Integer surrogate keys need a key registry synced from the warehouse"
+        )
+    key_mapper = SurrogateKeyMapper(key_registry) if key_mode == 'integer' else None
+    base_gen = BaseTableGenerator(data, key_mapper=key_mapper)
     base_gen.preprocess()
-    bg_logger.info("Data preprocessed successfully.")
+    bg_logger.info("Data preprocessed successfully in %s", str(datetime.now() - start_time))
 
-    dim_time_gen = DimTimeGenerator(base_gen.df)
-    dim_time = dim_time_gen.generate_table()
-    bg_logger.info("dim_time table generated successfully.")
+    max_workers = len(_TABLE_GENERATORS) if max_workers is None else max_workers
+    _generator_kwargs = {'dim_time': {'calendar': calendar}}
+    if max_workers <= 1:
+        tables = {
+            table_name: _generate_table(
+                bg_logger, table_name, base_gen.df, **_generator_kwargs.get(table_name, {})
+            )
+            for table_name in _TABLE_GENERATORS
+        }
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            _futures = {
+                table_name: executor.submit(
+                    _generate_table, bg_logger, table_name, base_gen.df,
+                    **_generator_kwargs.get(table_name, {})
+                )
+                for table_name in _TABLE_GENERATORS
+            }
+            tables = {table_name: future.result() for table_name, future in _futures.items()}
 
-    dim_location_gen = DimLocationGenerator(base_gen.df)
-    dim_location = dim_location_gen.generate_table()
-    bg_logger.info("dim_location table generated successfully.")
+    if key_mapper is not None:
+        tables['surrogate_key_map'] = key_mapper.mapping_table()
 
-    dim_product_gen = DimProductGenerator(base_gen.df)
-    dim_product = dim_product_gen.generate_table()
-    bg_logger.info("dim_product table generated successfully.")
+    bg_logger.info(
+        "All tables generated successfully in %s", str(datetime.now() - start_time)
+    )
+    return tables
 
-    dim_metadata_gen = DimMetadataTransactionGenerator(base_gen.df)
-    dim_metadata_transactions = dim_metadata_gen.generate_table()
-    bg_logger.info("dim_metadata_transactions table generated successfully.")
+class ValidationErrorStore:
+    """
+    Bounded store of the validation errors of the warehouse tables.
 
-    dim_customer_gen = DimCustomerGenerator(base_gen.df)
-    dim_customer = dim_customer_gen.generate_table()
-    bg_logger.info("dim_customer table generated successfully.")
+    Errors are aggregated by (table, field, error type) with their counts and a
+    reservoir sample of example rows, so memory stays flat however dirty the input is.
+    The full list of invalid rows is optionally spilled, in batches, to a Parquet
+    quarantine file (one entry per table, row index, field and error type).
+    """
+    quarantine_schema = pa.schema([
+        ('table_name', pa.string()),
+        ('row_index', pa.int64()),
+        ('field', pa.string()),
+        ('error_type', pa.string()),
+    ])
 
-    fact_gen = FactSalesTransactionGenerator(base_gen.df)
-    fact_sales_transactions = fact_gen.generate_table()
-    bg_logger.info(
-        "fact_sales_transactions table generated successfully."
-    )
+    def __init__(
+        self,
+        sample_size: int = _ERROR_SAMPLE_SIZE,
+        quarantine_path: str = None,
+        seed: int = None
+    ):
+        """
+        Args:
+            sample_size: Example rows kept per (table, field, error type).
+            quarantine_path: Parquet file receiving every invalid row (None disables it).
+            seed: Seed of the reservoir sampling.
+        """
+        self.sample_size = sample_size
+        self.quarantine_path = quarantine_path
+        self.groups = {}
+        self.invalid_rows = {}
+        self._random = random.Random(seed)
+        self._buffer = {name: [] for name in self.quarantine_schema.names}
+        self._writer = None
 
-    bg_logger.info("All tables generated successfully.")
-    return {
-        'dim_time': dim_time,
-        'dim_location': dim_location,
-        'dim_product': dim_product,
-        'dim_customer': dim_customer,
-        'dim_metadata_transactions': dim_metadata_transactions,
-        'fact_sales_transactions': fact_sales_transactions,
-    }
+    def add(self, table_name: str, row_index: int, errors: List[Dict[str, Any]]):
+        """
+        Records the Pydantic errors of an invalid row.
+        """
+        self.invalid_rows[table_name] = self.invalid_rows.get(table_name, 0) + 1
+        for error in errors:
+            _field = ".".join(map(str, error["loc"])) or "__root__"
+            _group = self.groups.setdefault(
+                (table_name, _field, error["type"]), {"count": 0, "samples": []}
+            )
+            _group["count"] += 1
+
+            # reservoir sampling: each row of the group is kept with the same probability
+            _sample = {"row_index": row_index, "msg": error["msg"], "input": error.get("input")}
+            if len(_group["samples"]) < self.sample_size:
+                _group["samples"].append(_sample)
+            else:
+                _slot = self._random.randrange(_group["count"])
+                if _slot < self.sample_size:
+                    _group["samples"][_slot] = _sample
+
+            if self.quarantine_path:
+                self._buffer['table_name'].append(table_name)
+                self._buffer['row_index'].append(row_index)
+                self._buffer['field'].append(_field)
+                self._buffer['error_type'].append(error["type"])
+
+        if len(self._buffer['row_index']) >= _QUARANTINE_BATCH_SIZE:
+            self._flush()
+
+    def sink(self, table_name: str) -> Callable[[int, List[Dict[str, Any]]], None]:
+        """
+        Returns the error callback of a table, as expected by the validators.
+        """
+        return lambda row_index, errors: self.add(table_name, row_index, errors)
+
+    def summary(self, table_name: str = None) -> List[Dict[str, Any]]:
+        """
+        Returns the aggregated errors (of a table, or of every table), most frequent first.
+        """
+        _summary = [
+            {"table": table, "field": field, "error_type": error_type, **group}
+            for (table, field, error_type), group in self.groups.items()
+            if table_name is None or table == table_name
+        ]
+        return sorted(_summary, key=lambda entry: entry["count"], reverse=True)
+
+    def _flush(self):
+        """
+        Spills the buffered invalid rows to the quarantine file.
+        """
+        if not self.quarantine_path:
+            return
+        if self._writer is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.quarantine_path)), exist_ok=True)
+            self._writer = pq.ParquetWriter(f"{self.quarantine_path}.tmp", self.quarantine_schema)
+        if self._buffer['row_index']:
+            self._writer.write_table(
+                pa.Table.from_pydict(self._buffer, schema=self.quarantine_schema)
+            )
+            self._buffer = {name: [] for name in self.quarantine_schema.names}
+
+    def close(self):
+        """
+        Writes the remaining invalid rows and publishes the quarantine file atomically
+        (an empty one when every row is valid).
+        """
+        if not self.quarantine_path:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+        os.replace(f"{self.quarantine_path}.tmp", self.quarantine_path)
+
+    def abort(self):
+        """
+        Closes the quarantine file without publishing it, removing its partial copy
+        (no-op once closed).
+        """
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        _tmp_path = f"{self.quarantine_path}.tmp"
+        if os.path.exists(_tmp_path):
+            os.remove(_tmp_path)
+
+# Field constraints checked as column predicates, as (constraint, value attribute, check)
+_FIELD_CONSTRAINTS = {
+    annotated_types.MaxLen: ('max_length', lambda values, limit: values <= limit),
+    annotated_types.MinLen: ('min_length', lambda values, limit: values >= limit),
+    annotated_types.Gt: ('gt', lambda values, limit: values > limit),
+    annotated_types.Ge: ('ge', lambda values, limit: values >= limit),
+    annotated_types.Lt: ('lt', lambda values, limit: values < limit),
+    annotated_types.Le: ('le', lambda values, limit: values <= limit),
+}
+
+class ColumnarModelValidator:
+    """
+    Columnar validation of DataFrames against a Pydantic model.
+
+    The Field constraints of the model (required, optional, str/int/bool types,
+    length and bound constraints) are compiled into column predicates evaluated once
+    per distinct value and broadcast back to the rows; fields the predicates can not
+    express (custom validators, other types) are validated by Pydantic once per distinct
+    value. Predicates only mark rows as valid when Pydantic would accept them, so the
+    remaining rows are validated row by row to produce the detailed errors.
+    """
+    def __init__(self, model: Type[BaseModel]):
+        """
+        Args:
+            model: Pydantic model validating each row.
+        """
+        self.model = model
+        self._instance = model.model_construct()
+        _decorators = model.__pydantic_decorators__
+        self._validated_fields = {
+            field
+            for decorator in _decorators.field_validators.values()
+            for field in decorator.info.fields
+        }
+        # model-level rules can only be checked row by row
+        self.row_wise = bool(
+            _decorators.model_validators
+            or model.model_config.get('extra') == 'forbid'
+            or model.model_config.get('strict')
+            or any(
+                field.alias or field.validation_alias
+                for field in model.model_fields.values()
+            )
+        )
+        self.fields = {
+            name: self._compile_field(name, field)
+            for name, field in model.model_fields.items()
+        }
+
+    def _compile_field(self, name: str, field: FieldInfo) -> Dict[str, Any]:
+        """
+        Compiles the type and constraints of a field (base type None falls back to Pydantic).
+        """
+        annotation, metadata, optional = field.annotation, list(field.metadata), False
+        if get_origin(annotation) is Union and type(None) in get_args(annotation):
+            _args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            optional = True
+            annotation = _args[0] if len(_args) == 1 else None
+        if get_origin(annotation) is Annotated:
+            annotation, *_extra = get_args(annotation)
+            for item in _extra:
+                metadata.extend(item.metadata if isinstance(item, FieldInfo) else [item])
+
+        _constraints = []
+        for item in metadata:
+            if type(item) not in _FIELD_CONSTRAINTS:
+                annotation = None
+                break
+            _attribute, _check = _FIELD_CONSTRAINTS[type(item)]
+            _constraints.append((_check, getattr(item, _attribute)))
+
+        if annotation not in (str, int, bool) or name in self._validated_fields:
+            annotation = None
+        return {
+            'required': field.is_required(),
+            'optional': optional,
+            'type': annotation,
+            'constraints': _constraints,
+        }
+
+    def _field_accepts(self, name: str, value) -> bool:
+        """
+        Validates a single value of a field with Pydantic (including its validators).
+        """
+        try:
+            self.model.__pydantic_validator__.validate_assignment(self._instance, name, value)
+            return True
+        except ValidationError:
+            return False
+
+    def _check_values(self, name: str, spec: Dict[str, Any], values: pd.Index) -> np.ndarray:
+        """
+        Returns which distinct (non-missing) values of a field are valid.
+        """
+        if spec['type'] is None:
+            # numpy scalars are boxed to Python ones, as row.to_dict() does
+            return np.fromiter((
+                self._field_accepts(
+                    name, value.item() if isinstance(value, (np.number, np.bool_)) else value
+                )
+                for value in values
+            ), dtype=bool, count=len(values))
+
+        if spec['type'] is str:
+            _valid = np.fromiter(
+                (isinstance(value, str) for value in values), dtype=bool, count=len(values)
+            )
+            _measures = pd.Series(
+                [len(value) if is_str else 0 for value, is_str in zip(values, _valid)], dtype='int64'
+            ).to_numpy()
+        elif spec['type'] is int:
+            _valid = np.fromiter((
+                isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+                or isinstance(value, (float, np.floating)) and np.isfinite(value)
+                and float(value).is_integer()
+                for value in values
+            ), dtype=bool, count=len(values))
+            _measures = np.where(_valid, pd.to_numeric(pd.Series(values), errors='coerce'), 0)
+        else:
+            _valid = np.fromiter(
+                (isinstance(value, (bool, np.bool_)) for value in values), dtype=bool, count=len(values)
+            )
+            _measures = np.zeros(len(values))
+
+        for _check, _limit in spec['constraints']:
+            _valid &= _check(_measures, _limit)
+        return _valid
+
+    def _check_column(self, name: str, spec: Dict[str, Any], column: pd.Series) -> np.ndarray:
+        """
+        Returns which rows of a column are valid, checking each distinct value once.
+        """
+        codes, uniques = pd.factorize(column)
+        _valid_uniques = self._check_values(name, spec, pd.Index(uniques, dtype=object))
+        valid = np.append(_valid_uniques, False).take(codes)
+
+        # missing values (None, NaN, NA, NaT) are checked once per kind
+        _missing = np.flatnonzero(codes < 0)
+        if len(_missing):
+            _kinds = {}
+            _values = column.to_numpy(dtype=object)
+            for position in _missing:
+                _kind = type(_values[position])
+                if _kind not in _kinds:
+                    _kinds[_kind] = (
+                        self._field_accepts(name, _values[position]) if spec['type'] is None
+                        else _values[position] is None and spec['optional']
+                    )
+                valid[position] = _kinds[_kind]
+        return valid
+
+    def validate(
+        self,
+        df: pd.DataFrame,
+        on_error: Callable[[Any, List[Dict[str, Any]]], None] = None
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """
+        Validates every row of a DataFrame.
+
+        Args:
+            df: DataFrame to validate.
+            on_error: Called with (row index, Pydantic errors) of each invalid row,
+                instead of collecting them.
+
+        Returns:
+            Boolean mask of the valid rows, and the errors of the invalid ones
+            ({"row_index", "error"} as produced by Pydantic), in row order
+            (empty when on_error is given).
+        """
+        valid = np.ones(len(df), dtype=bool)
+        if self.row_wise:
+            valid[:] = False
+        else:
+            for name, spec in self.fields.items():
+                if name not in df.columns:
+                    if spec['required']:
+                        valid[:] = False
+                    continue
+                valid &= self._check_column(name, spec, df[name])
+
+        errors = []
+        _suspects = np.flatnonzero(~valid)
+        for position, (idx, row) in zip(_suspects, df.iloc[_suspects].iterrows()):
+            try:
+                self.model(**row.to_dict())
+                valid[position] = True
+            except ValidationError as e:
+                if on_error is not None:
+                    on_error(idx, e.errors())
+                else:
+                    errors.append({"row_index": idx, "error": e.errors()})
+        return valid, errors
+
+@lru_cache(maxsize=None)
+def get_columnar_validator(model: Type[BaseModel]) -> ColumnarModelValidator:
+    """
+    Returns the (cached) columnar validator of a Pydantic model.
+    """
+    return ColumnarModelValidator(model)
+
+@lru_cache(maxsize=None)
+def _get_list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    Returns the (cached, per process) TypeAdapter validating a list of model rows.
+    """
+    return TypeAdapter(List[model])
+
+def _validate_chunk(model: Type[BaseModel], chunk: pd.DataFrame) -> List[Tuple[int, List[Dict]]]:
+    """
+    Validates a chunk of rows in a single TypeAdapter call.
+
+    Returns:
+        (position in the chunk, Pydantic errors) of every invalid row.
+    """
+    try:
+        _get_list_adapter(model).validate_python(chunk.to_dict(orient="records"))
+        return []
+    except ValidationError as e:
+        _errors = {}
+        for error in e.errors():
+            # errors are located as (row position, field, ...) in the list
+            _position, *_loc = error["loc"]
+            _errors.setdefault(_position, []).append({**error, "loc": tuple(_loc)})
+        return sorted(_errors.items())
+
+def validate_rows_pydantic(
+    model: Type[BaseModel],
+    df: pd.DataFrame,
+    executor: ProcessPoolExecutor = None,
+    chunk_size: int = _VALIDATION_CHUNK_SIZE,
+    on_error: Callable[[Any, List[Dict[str, Any]]], None] = None
+) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """
+    Validates every row of a DataFrame with Pydantic, in chunks validated by
+    TypeAdapter(list[model]), optionally spread over a process pool.
+
+    Args:
+        model: Pydantic model validating each row.
+        df: DataFrame to validate.
+        executor: Process pool validating the chunks (None validates them in process).
+        chunk_size: Rows per chunk.
+        on_error: Called with (row index, Pydantic errors) of each invalid row,
+            instead of collecting them.
+
+    Returns:
+        Boolean mask of the valid rows, and the errors of the invalid ones
+        ({"row_index", "error"}, with the original row index), in row order
+        (empty when on_error is given).
+    """
+    _starts = range(0, len(df), chunk_size)
+    _chunks = (df.iloc[start:start + chunk_size] for start in _starts)
+    if executor is None:
+        _results = (_validate_chunk(model, chunk) for chunk in _chunks)
+    else:
+        _results = executor.map(_validate_chunk, [model] * len(_starts), _chunks)
+
+    valid = np.ones(len(df), dtype=bool)
+    errors = []
+    # chunk results are consumed as they complete, so only a chunk of errors is held
+    for start, chunk_errors in zip(_starts, _results):
+        if not chunk_errors:
+            continue
+        _positions = [start + position for position, _ in chunk_errors]
+        valid[_positions] = False
+        for idx, (_, row_errors) in zip(df.index.take(_positions).tolist(), chunk_errors):
+            if on_error is not None:
+                on_error(idx, row_errors)
+            else:
+                errors.append({"row_index": idx, "error": row_errors})
+    return valid, errors
 
 def validate_warehouse_sales_data(
     bg_logger,
     dataframes: Dict[str, pd.DataFrame],
     validation_models: Dict[str, Type[BaseModel]],
-    return_valid_rows: bool = False
+    return_valid_rows: bool = False,
+    engine: str = 'columnar',
+    max_workers: int = None,
+    chunk_size: int = _VALIDATION_CHUNK_SIZE,
+    error_sample_size: int = _ERROR_SAMPLE_SIZE,
+    quarantine_path: str = None
 ) -> Dict[str, Any]:
     """
-    Validates the data in each table against its corresponding Pydantic model.
+    Validates the data in each table against its corresponding Pydantic model,
+    either with column predicates compiled from the model (see ColumnarModelValidator)
+    or with Pydantic on every row, in chunks spread over a process pool.
+
+    Errors are aggregated by (field, error type) with their counts and a sample of
+    example rows (see ValidationErrorStore), and every invalid row is optionally
+    written to a Parquet quarantine file.
 
     Args:
         bg_logger:
@@ -300,39 +1618,59 @@ def validate_warehouse_sales_data(
         validation_models (Dict[str,
             Type[BaseModel]]): A dictionary mapping table names to Pydantic validation models.
         return_valid_rows (bool): If True, includes valid rows in the results.
+        engine (str): 'columnar' (default) or 'pydantic' (full Pydantic fidelity on every row).
+        max_workers (int): Processes validating chunks with the pydantic engine
+            (default is the number of CPUs, 1 validates them in process).
+        chunk_size (int): Rows per chunk with the pydantic engine.
+        error_sample_size (int): Example rows kept per (field, error type).
+        quarantine_path (str): Parquet file receiving the invalid rows (None disables it).
 
     Returns:
-        Dict[str, Any]: Validation results, including errors and optionally valid rows if any exist.
+        Dict[str, Any]: Validation results, including the aggregated errors and optionally
+            valid rows if any exist.
     """
-    bg_logger.info("Validating data...")
+    if engine not in ('columnar', 'pydantic'):
+        raise ValueError(f"Unknown validation engine: {engine}")
+    bg_logger.info("Validating data with the %s engine...", engine)
+
+    error_store = ValidationErrorStore(error_sample_size, quarantine_path)
+    executor = None
+    if engine == 'pydantic' and (max_workers is None or max_workers > 1):
+        executor = ProcessPoolExecutor(max_workers=max_workers)
 
     results = {}
-    for table_name, df in dataframes.items():
-        bg_logger.info(f"Validating table: {table_name}")
-        model = validation_models.get(table_name)
-        if not model:
-            raise ValueError(f"No validation model found for table: {table_name}")
+    try:
+        for table_name, df in dataframes.items():
+            bg_logger.info(f"Validating table: {table_name}")
+            model = validation_models.get(table_name)
+            if not model:
+                raise ValueError(f"No validation model found for table: {table_name}")
 
-        errors = []
-        valid_rows = []
+            start_time = datetime.now()
+            _on_error = error_store.sink(table_name)
+            if engine == 'pydantic':
+                valid, _ = validate_rows_pydantic(model, df, executor, chunk_size, _on_error)
+            else:
+                valid, _ = get_columnar_validator(model).validate(df, _on_error)
+            bg_logger.info(
+                "Table %s validated in %s", table_name, str(datetime.now() - start_time)
+            )
 
-        for idx, row in df.iterrows():
-            try:
-                # pylint: disable=unused-variable
-                # Attempt to validate the row
-                validated_row = model(**row.to_dict())
-                if return_valid_rows:
-                    valid_rows.append(row)
-            except ValidationError as e:
-                # Collect validation errors
-                errors.append({"row_index": idx, "error": e.errors()})
-
-        results[table_name] = {
-            "valid_rows_count": len(df) - len(errors),
-            "invalid_rows_count": len(errors),
-            "errors": errors,
-            "valid_rows": pd.DataFrame(valid_rows) if return_valid_rows else None,
-        }
+            _invalid_rows = error_store.invalid_rows.get(table_name, 0)
+            results[table_name] = {
+                "valid_rows_count": len(df) - _invalid_rows,
+                "invalid_rows_count": _invalid_rows,
+                "errors": error_store.summary(table_name),
+                "valid_rows": df[valid] if return_valid_rows else None,
+            }
+        error_store.close()
+        if quarantine_path:
+            bg_logger.info("Invalid rows quarantined to %s", quarantine_path)
+    finally:
+        # a failed validation leaves no open writer nor partial quarantine file behind
+        error_store.abort()
+        if executor is not None:
+            executor.shutdown()
 
     return results
 
@@ -346,8 +1684,11 @@ def validate_data_integrity(bg_logger, data_integrity_check: Dict[str, Any]):
         bg_logger.info(f"Valid rows: {result.get('valid_rows_count', 0)}")
         bg_logger.info(f"Invalid rows: {result.get('invalid_rows_count', 0)}")
 
-        if result.get("errors"):
-            bg_logger.info(f"Errors: {result['errors'][:2]}")
+        for error in result.get("errors") or []:
+            bg_logger.info(
+                f"Errors: {error['field']} [{error['error_type']}] x{error['count']}, "
+                f"e.g. {error['samples'][:2]}"
+            )
 
         bg_logger.info("*" * 32)
     bg_logger.info("Data integrity check completed.")
@@ -4,31 +4,48 @@ It sets up paths, initializes logging, and logs execution time.
 
 It is meant to be run as orchestrator for the application.
 """
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import hashlib
+import json
 import os
+import tempfile
 
 import pandas as pd
 import dotenv
 
-from utils import (
+# Load environment variables, before the models (typed by WAREHOUSE_KEY_MODE)
+dotenv.load_dotenv()
+
+from utils import (  # pylint: disable=wrong-import-position
     get_current_utc_time,
     create_logger,
-    extract_7z,
-    validate_file_exists
+    read_7z_member,
+    extract_7z_member,
+    validate_file_exists,
+    load_ingestion_cache,
+    save_ingestion_cache
 )
 
-from infra.pipeline import (
+from infra.pipeline import (  # pylint: disable=wrong-import-position
+    get_csv_df,
+    concat_ingestion_frames,
+    INGESTION_SCHEMA,
+    INGESTION_DATE_FORMATS,
+    STAGE_III_DTYPES,
     PipelineTransformer,
+    CalendarDimension,
+    DimensionKeyRegistry,
+    RowFingerprintIndex,
+    models_map,
     sanitize_column_data,
     sanitize_text
 )
-from infra.handlers import (
+from infra.handlers import (  # pylint: disable=wrong-import-position
     MssqlConnector,
     create_warehouse_schema
 )
-from infra.models import Base
-
-# Load environment variables
-dotenv.load_dotenv()
+from infra.models import Base  # pylint: disable=wrong-import-position
 
 
 # based on current file location, assuming it's root
@@ -46,6 +63,81 @@ bg_logger = create_logger(
 # if not checked, it will be created locally
 _MIGRATE_DATABASE = True
 
+# archives to ingest, as a glob (or list of paths) relative to the ingestion folder
+_INGESTION_ARCHIVES = 'Invoices_Year_2009-2010.7z'
+# worker processes decompressing/parsing archives in parallel
+_INGESTION_WORKERS = os.cpu_count()
+
+# keeps a decompressed copy of the ingested csv next to the archive
+_KEEP_EXTRACTED = False
+
+# reuses the typed frame of unchanged archives (full mode only)
+_USE_INGESTION_CACHE = True
+# cached frames are only valid for the schema they were read with
+_INGESTION_FINGERPRINT = json.dumps(
+    [INGESTION_SCHEMA, INGESTION_DATE_FORMATS], sort_keys=True
+)
+
+# csv read parameters, the columns are typed and projected by the ingestion schema
+_base_df_params = {
+    'sep': ',',
+    'encoding': 'latin1'
+}
+
+# threads generating the warehouse tables (1 generates them sequentially)
+_TABLE_WORKERS = os.cpu_count()
+
+# persists the calendar dimension joined to dim_time, reused across runs
+_USE_CALENDAR_CACHE = True
+
+# keeps a local registry of the keys loaded into the warehouse,
+# so only new dimension members are emitted on the next runs
+_USE_KEY_REGISTRY = True
+
+# keeps a local index of the fingerprints of the rows loaded into the warehouse,
+# so reloads of overlapping extracts only send new or changed rows
+_USE_ROW_FINGERPRINTS = True
+
+# warehouse tables validation: 'columnar' engine, or 'pydantic' (full fidelity on
+# every row) validating chunks of rows on worker processes
+_validation_params = {
+    'engine': 'columnar',
+    'max_workers': os.cpu_count(),
+    'chunk_size': 50_000,
+    'error_sample_size': 5
+}
+
+# spills every invalid row (table, row index, field, error type) to a Parquet quarantine file
+_QUARANTINE_INVALID_ROWS = True
+
+# strategy loading each warehouse table: 'merge' (ORM insert or update, row by row),
+# 'bulk' (Core insert executemany in batches, fast_executemany with pyodbc) or
+# 'upsert' (bulk insert into a staging table, then one set-based MERGE);
+# bulk only inserts new rows, so every table is upserted: the key registry already
+# skips the dimension members loaded, but a rerun after a failed load (or a stale
+# registry) may still send rows the warehouse holds
+_load_strategies = {
+    'dim_time': 'upsert',
+    'dim_location': 'upsert',
+    'dim_product': 'upsert',
+    'dim_customer': 'upsert',
+    'dim_metadata_transactions': 'upsert',
+    'surrogate_key_map': 'upsert',
+    'fact_sales_transactions': 'upsert',
+}
+# rows per executemany call of the bulk loads (and upsert staging loads)
+_LOAD_BATCH_SIZE = 10_000
+# tables (dimensions, then fact partitions by invoice hash) loaded concurrently,
+# each one over its own pooled connection and transaction
+_LOAD_WORKERS = 4
+
+# runs stages I-III over invoice partitions bounded by the memory ceiling (MB);
+# archives are extracted to a scratch directory and streamed from disk, the ceiling
+# bounds each partition going through stages I-III, not the stage III output
+# (compact dtypes) of every archive, which is kept whole for the warehouse tables
+_CHUNKED_MODE = False
+_CHUNK_MEMORY_CEILING_MB = 512
+
 MSSQL_WAREHOUSE_URL=os.getenv("MSSQL_WAREHOUSE_URL")
 
 if not MSSQL_WAREHOUSE_URL:
@@ -54,61 +146,186 @@ if not MSSQL_WAREHOUSE_URL:
     )
     _MIGRATE_DATABASE = False
 
-def main_bg_invoice_warehousing():
+# surrogate keys of the star schema: 'hash' (MD5 hex) or 'integer' (BIGINT ids,
+# continuing the ones of the warehouse through the key registry)
+WAREHOUSE_KEY_MODE = os.getenv("WAREHOUSE_KEY_MODE", "hash").lower()
+
+if WAREHOUSE_KEY_MODE not in ("hash", "integer"):
+    bg_logger.warning(
+        "The environment variable 'WAREHOUSE_KEY_MODE' is not 'hash' or 'integer', using 'hash'"
+    )
+    WAREHOUSE_KEY_MODE = "hash"
+
+def ingest_archive(archive_path: str) -> pd.DataFrame:
     """
-    Main function of the application.
+    Loads the typed raw frame of a single archive, from the ingestion cache
+    when the archive did not change, otherwise decompressing and parsing it.
+
+    It is meant to be run on worker processes, one archive per call.
     """
-    # Initialize base utilities
-    _start_time = get_current_utc_time()
-    _ingestion_path = os.path.join(
+    _ingestion_cache_path = os.path.join(
         root_path,
-        "ingestion"
+        "ingestion_cache"
     )
-    _ingestion_filename = 'Invoices_Year_2009-2010'
+    _member = f"{os.path.splitext(os.path.basename(archive_path))[0]}.csv"
 
     # Validate compressed file existence
     validate_file_exists(
         bg_logger,
-        os.path.join(_ingestion_path, f"{_ingestion_filename}.7z")
+        archive_path
     )
 
-    # Decompress file
-    extract_7z(
+    if _USE_INGESTION_CACHE:
+        base_df = load_ingestion_cache(
+            bg_logger,
+            _ingestion_cache_path,
+            archive_path,
+            _INGESTION_FINGERPRINT
+        )
+        if base_df is not None:
+            return base_df
+
+    # Decompress file straight into memory
+    _ingestion_stream = read_7z_member(
         bg_logger,
-        os.path.join(_ingestion_path, f"{_ingestion_filename}.7z"),
+        archive_path,
+        member=_member,
+        keep_extracted=_KEEP_EXTRACTED
     )
 
-    # Load base data
-    _base_df_params = {
-        'sep': ',',
-        'encoding': 'latin1',
-        'low_memory': False
-    }
-    base_df = pd.read_csv(
-        os.path.join(_ingestion_path, f"{_ingestion_filename}.csv"),
+    # Load base data, typed and projected by the ingestion schema
+    base_df = get_csv_df(
+        bg_logger,
+        _ingestion_stream,
         **_base_df_params
     )
+    if _USE_INGESTION_CACHE:
+        save_ingestion_cache(
+            bg_logger,
+            _ingestion_cache_path,
+            archive_path,
+            _member,
+            _ingestion_stream,
+            base_df,
+            _INGESTION_FINGERPRINT
+        )
+    _ingestion_stream = None
+    return base_df
+
+
+def main_bg_invoice_warehousing(archives=None):
+    """
+    Main function of the application.
+
+    :param archives: Glob or list of 7z archives to ingest
+        (defaults to _INGESTION_ARCHIVES, relative to the ingestion folder).
+    """
+    # Initialize base utilities
+    _start_time = get_current_utc_time()
+    _ingestion_path = os.path.join(
+        root_path,
+        "ingestion"
+    )
+    archives = _INGESTION_ARCHIVES if archives is None else archives
+    if isinstance(archives, str):
+        archives = sorted(glob.glob(os.path.join(_ingestion_path, archives)))
+    else:
+        archives = [os.path.join(_ingestion_path, archive) for archive in archives]
+
+    if not archives:
+        bg_logger.critical("No archives to ingest in %s", _ingestion_path)
+        raise FileNotFoundError(f"No archives to ingest in {_ingestion_path}")
+    bg_logger.info("Ingesting %d archive(s): %s", len(archives), archives)
 
     # Initialize the transformer
+    # one key registry (and row fingerprint index) per warehouse and key mode
+    _warehouse_key = hashlib.md5(
+        f"{MSSQL_WAREHOUSE_URL}|{WAREHOUSE_KEY_MODE}".encode()
+    ).hexdigest()[:16]
+    _key_registry_path = os.path.join(
+        root_path, "ingestion_cache", f"key_registry_{_warehouse_key}.parquet"
+    )
+    _fingerprint_index_path = os.path.join(
+        root_path, "ingestion_cache", f"row_fingerprints_{_warehouse_key}.parquet"
+    )
+
     transformer = PipelineTransformer(
         bg_logger=bg_logger,
         f_sanitize_text=sanitize_text,
-        f_sanitize_column_data=sanitize_column_data
+        f_sanitize_column_data=sanitize_column_data,
+        table_workers=_TABLE_WORKERS,
+        calendar=CalendarDimension(
+            os.path.join(root_path, "ingestion_cache", "dim_calendar.parquet")
+            if _USE_CALENDAR_CACHE else None
+        ),
+        key_registry=DimensionKeyRegistry(
+            _key_registry_path
+        ) if _USE_KEY_REGISTRY and _MIGRATE_DATABASE else None,
+        validation_params={
+            **_validation_params,
+            'quarantine_path': os.path.join(
+                root_path, "ingestion_cache", "invalid_rows.parquet"
+            ) if _QUARANTINE_INVALID_ROWS else None
+        },
+        load_strategies=_load_strategies,
+        load_batch_size=_LOAD_BATCH_SIZE,
+        load_workers=_LOAD_WORKERS,
+        fingerprint_index=RowFingerprintIndex(
+            _fingerprint_index_path
+        ) if _USE_ROW_FINGERPRINTS and _MIGRATE_DATABASE else None
     )
 
-    # every stage can be saved to speed up the process
-    # starting from the previous stage if it exists
-    stage_i_df = transformer.stage_1(
-        base_df
-    )
+    if _CHUNKED_MODE:
+        # archives are natural invoice partitions, processed one after another
+        _stage_iii_parts = []
+        for archive_path in archives:
+            validate_file_exists(bg_logger, archive_path)
+            # the member is streamed from disk, never decompressed whole in memory
+            with tempfile.TemporaryDirectory(prefix="chunked_") as _scratch_dir:
+                _member_path = extract_7z_member(
+                    bg_logger,
+                    archive_path,
+                    member=f"{os.path.splitext(os.path.basename(archive_path))[0]}.csv",
+                    target_dir=None if _KEEP_EXTRACTED else _scratch_dir
+                )
+                _stage_iii_parts.append(
+                    transformer.run_chunked(
+                        _member_path,
+                        _CHUNK_MEMORY_CEILING_MB,
+                        scratch_dir=_scratch_dir,
+                        **_base_df_params
+                    )
+                )
+        stage_iii_df = concat_ingestion_frames(_stage_iii_parts, STAGE_III_DTYPES)
+        _stage_iii_parts = None
+    else:
+        if len(archives) == 1:
+            _archive_dfs = [ingest_archive(archives[0])]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(_INGESTION_WORKERS, len(archives))
+            ) as executor:
+                _archive_dfs = list(executor.map(ingest_archive, archives))
+        base_df = concat_ingestion_frames(_archive_dfs)
+        _archive_dfs = None
+        bg_logger.info(
+            "Ingestion of %d archive(s) completed in %s",
+            len(archives), get_current_utc_time() - _start_time
+        )
 
-    stage_ii_df = transformer.stage_2(
-        stage_i_df
-    )
+        # every stage can be saved to speed up the process
+        # starting from the previous stage if it exists
+        stage_i_df = transformer.stage_1(
+            base_df
+        )
 
-    stage_iii_df = transformer.stage_3(
-        stage_ii_df
-    )
+        stage_ii_df = transformer.stage_2(
+            stage_i_df
+        )
+
+        stage_iii_df = transformer.stage_3(
+            stage_ii_df
+        )
 
     # transformer.save_parquet_stage(
     #     stage_iii_df, 'stage_iii.parquet'
@@ -121,11 +338,15 @@ def main_bg_invoice_warehousing():
         try:
             mssql_instance = MssqlConnector(
                 bg_logger,
-                MSSQL_WAREHOUSE_URL
+                MSSQL_WAREHOUSE_URL,
+                pool_size=_LOAD_WORKERS
             )
             engine = mssql_instance.connect()
             create_warehouse_schema(engine)
-            Base.metadata.create_all(bind=engine)
+            Base.metadata.create_all(
+                bind=engine,
+                tables=[model.__table__ for model in models_map.values()]
+            )
             transformer.generates_dw_tables(
                 stage_iii_df,
                 engine
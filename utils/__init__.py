@@ -12,12 +12,22 @@ from utils._references import (
 )
 from utils.file_handler import (
     extract_7z,
-    validate_file_exists
+    read_7z_member,
+    extract_7z_member,
+    validate_file_exists,
+    get_file_hash,
+    load_ingestion_cache,
+    save_ingestion_cache
 )
 
 __all__ = [
     "create_logger",
     "get_current_utc_time",
     "extract_7z",
-    'validate_file_exists'
+    "read_7z_member",
+    "extract_7z_member",
+    'validate_file_exists',
+    "get_file_hash",
+    "load_ingestion_cache",
+    "save_ingestion_cache"
 ]
@@ -2,10 +2,18 @@
 Handles file-related operations
 """
 from datetime import datetime
+import hashlib
+import io
+import json
 import os
+import shutil
 
+import pandas as pd
 import py7zr
 
+# read block size when hashing files
+_HASH_BLOCK_SIZE = 1024 ** 2
+
 
 def extract_7z(bg_logger, file_path):
     """
@@ -36,6 +44,87 @@ def extract_7z(bg_logger, file_path):
     del extract_dir
 
 
+def read_7z_member(bg_logger, file_path, member=None, keep_extracted=False) -> io.BytesIO:
+    """
+    Decompresses a single member of a 7z file straight into memory, so it
+    can be handed to the CSV parser as a file-like stream (whole or in chunks)
+    without writing and re-reading an extracted copy on disk.
+
+    :param bg_logger: initialized logger
+    :param file_path: Path to the 7z file to read.
+    :param member: Name of the archived file. Defaults to the first CSV member.
+    :param keep_extracted: If True, also writes the member next to the archive.
+    :return: Binary stream positioned at the start of the member.
+    """
+    # Record start time
+    start_time = datetime.now()
+
+    with py7zr.SevenZipFile(file_path, mode='r') as z:
+        if member is None:
+            member = next(
+                (name for name in z.getnames() if name.lower().endswith('.csv')),
+                None
+            )
+        if member is None or member not in z.getnames():
+            bg_logger.critical("Member %s not found in %s", member, file_path)
+            raise FileNotFoundError(f"Member {member} not found in {file_path}")
+
+        # py7zr decompresses the requested targets only, as in-memory buffers
+        stream = z.read(targets=[member])[member]
+
+    if keep_extracted:
+        extract_path = os.path.join(os.path.dirname(file_path), member)
+        with open(extract_path, 'wb') as f:
+            shutil.copyfileobj(stream, f)
+        stream.seek(0)
+        bg_logger.info("Member %s kept extracted at %s", member, extract_path)
+
+    # Calculate decompression duration
+    duration = datetime.now() - start_time
+
+    bg_logger.info(
+        "Member %s streamed from %s (%d bytes). Duration: %s",
+        member, file_path, stream.getbuffer().nbytes, duration
+    )
+    return stream
+
+
+def extract_7z_member(bg_logger, file_path, member=None, target_dir=None) -> str:
+    """
+    Extracts a single member of a 7z file to disk, decompressed in blocks, so it
+    can be streamed by the CSV parser (chunked mode) without holding the whole
+    decompressed member in memory.
+
+    :param bg_logger: initialized logger
+    :param file_path: Path to the 7z file to extract from.
+    :param member: Name of the archived file. Defaults to the first CSV member.
+    :param target_dir: Directory receiving the member. Defaults to the archive directory.
+    :return: Path to the extracted member.
+    """
+    # Record start time
+    start_time = datetime.now()
+    target_dir = target_dir or os.path.dirname(file_path)
+
+    with py7zr.SevenZipFile(file_path, mode='r') as z:
+        if member is None:
+            member = next(
+                (name for name in z.getnames() if name.lower().endswith('.csv')),
+                None
+            )
+        if member is None or member not in z.getnames():
+            bg_logger.critical("Member %s not found in %s", member, file_path)
+            raise FileNotFoundError(f"Member {member} not found in {file_path}")
+        z.extract(path=target_dir, targets=[member])
+
+    extract_path = os.path.join(target_dir, member)
+    bg_logger.info(
+        "Member %s extracted from %s to %s (%d bytes). Duration: %s",
+        member, file_path, extract_path, os.path.getsize(extract_path),
+        datetime.now() - start_time
+    )
+    return extract_path
+
+
 def validate_file_exists(bg_logger, file_path):
     """
     Validates if a file exists.
@@ -46,3 +135,112 @@ def validate_file_exists(bg_logger, file_path):
     if not os.path.exists(file_path):
         bg_logger.critical("File %s does not exist", file_path)
         raise FileNotFoundError(f"File {file_path} does not exist")
+
+
+def get_file_hash(file_path) -> str:
+    """
+    Returns the SHA-256 hex digest of a file path or an in-memory stream.
+
+    :param file_path: Path to the file or a binary stream (e.g. from read_7z_member).
+    :return: SHA-256 hex digest.
+    """
+    sha256 = hashlib.sha256()
+    if hasattr(file_path, 'getbuffer'):
+        sha256.update(file_path.getbuffer())
+        return sha256.hexdigest()
+
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _get_manifest_path(cache_dir, archive_path):
+    """
+    Returns the manifest path of an archive within the cache directory.
+    """
+    return os.path.join(cache_dir, f"{os.path.basename(archive_path)}.json")
+
+
+def load_ingestion_cache(bg_logger, cache_dir, archive_path, fingerprint=''):
+    """
+    Loads the cached typed frame of an archive, if the archive did not change
+    since it was cached.
+
+    :param bg_logger: initialized logger
+    :param cache_dir: Directory holding the manifests and cached Parquet files.
+    :param archive_path: Path to the 7z file.
+    :param fingerprint: Extra cache key (e.g. the ingestion schema) the cache must match.
+    :return: The cached DataFrame, or None on a cache miss.
+    """
+    manifest_path = _get_manifest_path(cache_dir, archive_path)
+    if not os.path.exists(manifest_path):
+        bg_logger.info("No ingestion cache found for %s", archive_path)
+        return None
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    # size is checked first, so most changes do not need a hash
+    parquet_path = os.path.join(cache_dir, manifest['parquet'])
+    if (
+        manifest['archive_size'] != os.path.getsize(archive_path)
+        or manifest['fingerprint'] != fingerprint
+        or not os.path.exists(parquet_path)
+        or manifest['archive_sha256'] != get_file_hash(archive_path)
+    ):
+        bg_logger.info("Ingestion cache of %s is stale", archive_path)
+        return None
+
+    start_time = datetime.now()
+    df = pd.read_parquet(parquet_path)
+    bg_logger.info(
+        "Ingestion cache hit for %s (member %s). Duration: %s",
+        archive_path, manifest['member'], datetime.now() - start_time
+    )
+    return df
+
+
+def save_ingestion_cache(
+    bg_logger, cache_dir, archive_path, member, member_stream, df, fingerprint=''
+):
+    """
+    Caches the typed frame of an archive as Parquet, recording on its manifest
+    the archive hash and size and the extracted member hash.
+
+    :param bg_logger: initialized logger
+    :param cache_dir: Directory holding the manifests and cached Parquet files.
+    :param archive_path: Path to the 7z file.
+    :param member: Name of the archived file the frame was read from.
+    :param member_stream: Stream of the decompressed member (as from read_7z_member).
+    :param df: Typed DataFrame read from the member.
+    :param fingerprint: Extra cache key (e.g. the ingestion schema) the cache must match.
+    """
+    start_time = datetime.now()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    archive_sha256 = get_file_hash(archive_path)
+    parquet_name = f"{archive_sha256}.parquet"
+    df.to_parquet(os.path.join(cache_dir, parquet_name), compression='snappy')
+
+    manifest = {
+        'archive': os.path.basename(archive_path),
+        'archive_size': os.path.getsize(archive_path),
+        'archive_sha256': archive_sha256,
+        'member': member,
+        'member_sha256': get_file_hash(member_stream),
+        'fingerprint': fingerprint,
+        'parquet': parquet_name,
+        'created_at': datetime.now().isoformat(),
+    }
+
+    # replaced at once, so a concurrent reader never sees a partial manifest
+    manifest_path = _get_manifest_path(cache_dir, archive_path)
+    with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    bg_logger.info(
+        "Ingestion cache saved for %s. Duration: %s",
+        archive_path, datetime.now() - start_time
+    )